@@ -1,22 +1,27 @@
 from datetime import date
 
-from flask import Flask
+import click
+from flask import Flask, request
 
 from config import CATEGORY_OPTIONS, TAG_OPTIONS
-from extensions.database import init_db
+from extensions import sql_profiler
+from extensions.database import get_connection, init_app, init_db, rebuild_rollups
 from routes.ai_routes import bp as ai_bp
 from routes.analysis_routes import bp as analysis_bp
 from routes.budget_routes import bp as budget_bp
 from routes.goal_routes import bp as goal_bp
 from routes.subscription_routes import bp as subscription_bp
 from routes.transaction_routes import bp as transaction_bp
-from services.subscription_service import process_due_subscription_charges
+from services.import_service import IMPORT_FORMATS, detect_import_format, import_transactions
+from services.subscription_service import sync_due_subscription_charges
 
 
 def create_app() -> Flask:
     app = Flask(__name__)
 
     init_db()
+    init_app(app)
+    sql_profiler.init_app(app)
 
     @app.context_processor
     def inject_fab_context():
@@ -27,8 +32,31 @@ def create_app() -> Flask:
         }
 
     @app.before_request
-    def sync_due_subscription_charges():
-        process_due_subscription_charges()
+    def sync_due_subscription_charges_before_request():
+        if request.endpoint in (None, "static"):
+            return
+        sync_due_subscription_charges()
+
+    @app.cli.command("rebuild-rollups")
+    def rebuild_rollups_command():
+        with get_connection() as conn:
+            rebuild_rollups(conn)
+        click.echo("rollup tables rebuilt")
+
+    @app.cli.command("import-transactions")
+    @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+    @click.option("--format", "file_format", type=click.Choice(IMPORT_FORMATS), help="defaults to the file extension")
+    def import_transactions_command(path, file_format):
+        file_format = detect_import_format(path, file_format)
+        if file_format is None:
+            raise click.UsageError("cannot infer the format from the file extension, pass --format")
+
+        with open(path, "rb") as handle:
+            report = import_transactions(handle, file_format)
+
+        for error in report["errors"]:
+            click.echo(f"line {error['line']}: {error['error']}", err=True)
+        click.echo(f"imported {report['imported']} transactions, {report['failed']} failed")
 
     app.register_blueprint(transaction_bp)
     app.register_blueprint(budget_bp)
@@ -0,0 +1,21 @@
+import os
+import sys
+from pathlib import Path
+
+DB_PATH_ENV = "MONEY_MANAGER_DB_PATH"
+
+
+def use_database(path: str | Path) -> Path:
+    db_path = Path(path).resolve()
+    if "config" in sys.modules and Path(sys.modules["config"].DB_PATH).resolve() != db_path:
+        raise RuntimeError("config was imported before the benchmark database was selected")
+    os.environ[DB_PATH_ENV] = str(db_path)
+    return db_path
+
+
+def percentile(values: list[float], ratio: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-int(ratio * 100) * len(ordered) // 100))
+    return ordered[min(rank, len(ordered)) - 1]
@@ -0,0 +1,233 @@
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from benchmarks.common import use_database
+
+SCALES = {
+    "1k": 1_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+EXPENSE_PROFILES = {
+    "餐饮": (0.38, 22.0, ["早餐", "午餐", "晚餐", "奶茶", "夜宵", "零食"]),
+    "交通": (0.12, 9.0, ["地铁", "公交", "打车", "共享单车"]),
+    "生活": (0.15, 35.0, ["日用品", "水电", "话费", "洗衣"]),
+    "娱乐": (0.10, 48.0, ["电影", "游戏", "演出"]),
+    "学习": (0.07, 60.0, ["教材", "课程", "文具"]),
+    "人际": (0.06, 80.0, ["聚餐", "礼物", "红包"]),
+    "健康": (0.04, 55.0, ["药品", "健身", "体检"]),
+    "其他": (0.08, 30.0, []),
+}
+
+TAG_WEIGHTS = {
+    "冲动": 0.22,
+    "刚需": 0.30,
+    "投资自己": 0.06,
+    "社交": 0.10,
+    "情绪消费": 0.08,
+    "宿舍": 0.06,
+    "校外": 0.06,
+    "旅行": 0.03,
+    "约会": 0.04,
+    "学习投资": 0.05,
+}
+
+INCOME_SOURCES = ["生活费", "兼职", "奖学金", "红包", "理财收益"]
+
+SUBSCRIPTION_NAMES = [
+    "视频会员",
+    "音乐会员",
+    "网盘",
+    "云服务器",
+    "健身房",
+    "外卖会员",
+    "读书会员",
+    "学习平台",
+    "游戏月卡",
+    "手机套餐",
+]
+
+SUBSCRIPTION_AMOUNTS = {
+    "weekly": (5.0, 30.0),
+    "monthly": (10.0, 120.0),
+    "quarterly": (30.0, 300.0),
+    "yearly": (88.0, 998.0),
+}
+
+INCOME_RATIO = 0.06
+
+
+def _month_starts(end_month: str, count: int) -> list[date]:
+    year, month = (int(part) for part in end_month.split("-"))
+    starts = []
+    for _ in range(count):
+        starts.append(date(year, month, 1))
+        month -= 1
+        if month == 0:
+            year, month = year - 1, 12
+    return list(reversed(starts))
+
+
+def _month_days(month_start: date, last_day: date) -> list[date]:
+    next_month = (month_start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    final_day = min(next_month - timedelta(days=1), last_day)
+    return [month_start + timedelta(days=offset) for offset in range((final_day - month_start).days + 1)]
+
+
+def _pick_tags(rng: random.Random, category: str) -> list[str]:
+    if rng.random() > 0.45:
+        return []
+    tags = rng.choices(list(TAG_WEIGHTS), weights=list(TAG_WEIGHTS.values()), k=rng.choice((1, 1, 2)))
+    if category == "学习" and rng.random() < 0.5:
+        tags.append("学习投资")
+    return sorted(set(tags))
+
+
+def _build_expense(rng: random.Random, tag_options: set[str], day: date) -> dict:
+    category = rng.choices(list(EXPENSE_PROFILES), weights=[profile[0] for profile in EXPENSE_PROFILES.values()])[0]
+    _, median, sub_categories = EXPENSE_PROFILES[category]
+    amount = round(max(0.5, rng.lognormvariate(0, 0.75) * median), 2)
+    return {
+        "amount": amount,
+        "type": "expense",
+        "date": day.isoformat(),
+        "category_main": category,
+        "category_sub": rng.choice(sub_categories) if sub_categories else None,
+        "tags": [tag for tag in _pick_tags(rng, category) if tag in tag_options],
+        "note": None,
+    }
+
+
+def _build_income(rng: random.Random, day: date, amount: float) -> dict:
+    return {
+        "amount": max(0.01, round(amount, 2)),
+        "type": "income",
+        "date": day.isoformat(),
+        "category_main": "收入",
+        "category_sub": rng.choices(INCOME_SOURCES, weights=[0.55, 0.2, 0.05, 0.1, 0.1])[0],
+        "tags": [],
+        "note": None,
+    }
+
+
+def generate_transactions(rng: random.Random, tag_options: set[str], month_starts: list[date], total: int, last_day: date):
+    per_month = [total // len(month_starts)] * len(month_starts)
+    for index in range(total % len(month_starts)):
+        per_month[index] += 1
+
+    for month_start, count in zip(month_starts, per_month):
+        days = _month_days(month_start, last_day)
+        income_count = min(count, max(1, round(count * INCOME_RATIO)))
+        batch = [_build_expense(rng, tag_options, rng.choice(days)) for _ in range(count - income_count)]
+
+        income_total = sum(item["amount"] for item in batch) * rng.uniform(0.9, 1.2) or 1500.0
+        weights = [rng.uniform(0.5, 1.5) for _ in range(income_count)]
+        for weight in weights:
+            batch.append(_build_income(rng, rng.choice(days), income_total * weight / sum(weights)))
+        batch.sort(key=lambda item: item["date"])
+        yield batch
+
+
+def generate(args: argparse.Namespace) -> dict:
+    db_path = use_database(args.db)
+    if db_path.exists():
+        if not args.force:
+            raise SystemExit(f"{db_path} already exists, pass --force to overwrite")
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+
+    from config import CATEGORY_OPTIONS, SUBSCRIPTION_CYCLE_OPTIONS, TAG_OPTIONS
+    from extensions.database import close_pooled_connections, get_connection, init_db
+    from models.budget import upsert_budget
+    from models.goal import create_goal
+    from models.subscription import create_subscription
+    from models.transaction import insert_transactions
+    from utils.date_utils import month_date_bounds
+
+    rng = random.Random(args.seed)
+    end_month = args.end_month or date.today().strftime("%Y-%m")
+    month_starts = _month_starts(end_month, args.years * 12)
+    last_day = min(date.fromisoformat(month_date_bounds(end_month)[1]), date.today())
+    total = SCALES[args.scale] if args.transactions is None else args.transactions
+
+    started_at = time.perf_counter()
+    init_db()
+
+    inserted = 0
+    with get_connection() as conn:
+        for month_batch in generate_transactions(rng, set(TAG_OPTIONS), month_starts, total, last_day):
+            for offset in range(0, len(month_batch), args.batch_size):
+                inserted += len(insert_transactions(conn, month_batch[offset : offset + args.batch_size]))
+            conn.commit()
+
+    monthly_expense = total * 30.0 / len(month_starts)
+    for month_start in month_starts:
+        month = month_start.strftime("%Y-%m")
+        upsert_budget(month, None, round(monthly_expense * rng.uniform(0.85, 1.2), 2))
+        for category in CATEGORY_OPTIONS:
+            share = EXPENSE_PROFILES.get(category, (0.05,))[0]
+            upsert_budget(month, category, round(monthly_expense * share * rng.uniform(0.7, 1.3), 2))
+
+    for index in range(args.subscriptions):
+        cycle = rng.choice(SUBSCRIPTION_CYCLE_OPTIONS)
+        low, high = SUBSCRIPTION_AMOUNTS.get(cycle, (10.0, 100.0))
+        create_subscription(
+            {
+                "name": f"{SUBSCRIPTION_NAMES[index % len(SUBSCRIPTION_NAMES)]} #{index + 1}",
+                "amount": round(rng.uniform(low, high), 2),
+                "cycle": cycle,
+                "next_billing_date": (last_day - timedelta(days=rng.randint(0, args.due_backlog_days))).isoformat(),
+                "category": rng.choice(CATEGORY_OPTIONS),
+                "payment_method": rng.choice(["微信", "支付宝", "银行卡"]),
+            }
+        )
+
+    for index in range(args.goals):
+        deadline = last_day + timedelta(days=rng.randint(60, 900))
+        create_goal(f"储蓄目标 #{index + 1}", round(rng.uniform(1000, 30000), 2), deadline.isoformat())
+
+    close_pooled_connections()
+    return {
+        "db": str(db_path),
+        "transactions": inserted,
+        "months": len(month_starts),
+        "subscriptions": args.subscriptions,
+        "goals": args.goals,
+        "seconds": round(time.perf_counter() - started_at, 2),
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic MoneyManager ledger.")
+    parser.add_argument("--db", required=True, help="path of the SQLite file to create")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="1k")
+    parser.add_argument("--transactions", type=int, help="exact transaction count, overrides --scale")
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--end-month", help="last generated month (YYYY-MM), all other dates derive from it")
+    parser.add_argument("--subscriptions", type=int, default=12)
+    parser.add_argument("--goals", type=int, default=5)
+    parser.add_argument("--due-backlog-days", type=int, default=90, help="spread of overdue subscription billing dates")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--force", action="store_true", help="overwrite an existing database file")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    if args.years < 1:
+        raise SystemExit("--years must be at least 1")
+    summary = generate(args)
+    print(
+        f"generated {summary['transactions']} transactions over {summary['months']} months, "
+        f"{summary['subscriptions']} subscriptions, {summary['goals']} goals "
+        f"in {summary['seconds']}s -> {summary['db']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
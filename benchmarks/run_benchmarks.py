@@ -0,0 +1,279 @@
+import argparse
+import json
+import platform
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from benchmarks.common import percentile, use_database
+
+DEFAULT_TOLERANCE = 0.2
+NOISE_FLOOR_MS = 1.0
+
+
+def _copy_database(source: Path, target: Path) -> None:
+    source_conn = sqlite3.connect(f"file:{source}?mode=ro", uri=True)
+    target_conn = sqlite3.connect(target)
+    try:
+        source_conn.backup(target_conn)
+    finally:
+        target_conn.close()
+        source_conn.close()
+
+
+def _model_cases(month: str, as_of: str) -> list[tuple[str, object]]:
+    from models.analysis import get_ai_monthly_package, get_analysis_dashboard_data, get_monthly_insights
+    from models.budget import get_budget_execution, get_budget_health_profile
+    from models.goal import get_goal_progress_list
+    from models.net_flow import get_net_flow, get_savings_rate_series
+    from models.subscription import (
+        get_subscription_monthly_cost_summary,
+        get_subscription_monthly_metrics,
+        get_upcoming_subscriptions,
+        list_subscriptions,
+    )
+    from models.transaction import (
+        get_calendar_daily_expense,
+        get_monthly_dashboard_data,
+        get_monthly_stats,
+        get_recent_transactions,
+        get_tag_trend,
+        get_transactions_by_month,
+    )
+
+    year_ago = (date.fromisoformat(as_of) - timedelta(days=365)).isoformat()
+    return [
+        ("model.get_monthly_stats", lambda: get_monthly_stats(month)),
+        ("model.get_monthly_dashboard_data", lambda: get_monthly_dashboard_data(month=month)),
+        ("model.get_transactions_by_month", lambda: get_transactions_by_month(month)),
+        ("model.get_recent_transactions", lambda: get_recent_transactions(limit=10)),
+        ("model.get_calendar_daily_expense", lambda: get_calendar_daily_expense(month)),
+        ("model.get_tag_trend", lambda: get_tag_trend("冲动", month)),
+        ("model.get_monthly_insights", lambda: get_monthly_insights(month)),
+        ("model.get_analysis_dashboard_data", lambda: get_analysis_dashboard_data(month)),
+        ("model.get_ai_monthly_package", lambda: get_ai_monthly_package(month)),
+        ("model.get_budget_execution", lambda: get_budget_execution(month)),
+        ("model.get_budget_health_profile", lambda: get_budget_health_profile(month)),
+        ("model.get_goal_progress_list", lambda: get_goal_progress_list(date.fromisoformat(as_of))),
+        ("model.get_net_flow", lambda: get_net_flow(year_ago, as_of)),
+        ("model.get_savings_rate_series", lambda: get_savings_rate_series(month, count=12)),
+        ("model.list_subscriptions", list_subscriptions),
+        ("model.get_upcoming_subscriptions", lambda: get_upcoming_subscriptions(days=7)),
+        ("model.get_subscription_monthly_cost_summary", get_subscription_monthly_cost_summary),
+        ("model.get_subscription_monthly_metrics", lambda: get_subscription_monthly_metrics(month)),
+    ]
+
+
+def _route_cases(month: str) -> list[tuple[str, str]]:
+    paths = [
+        "/",
+        "/analysis",
+        "/budget",
+        "/goals",
+        "/subscriptions",
+        "/calendar",
+        "/ai",
+        "/api/transactions",
+        "/api/transactions/list",
+        "/api/stats/monthly",
+        "/api/stats/analysis",
+        "/api/insights/monthly",
+        "/api/budgets/health",
+        "/api/calendar",
+        "/api/dashboard/health",
+        "/api/dashboard/risk-cards",
+        "/api/dashboard/goals",
+        "/api/dashboard/subscriptions",
+        "/api/goals",
+        "/api/subscriptions",
+    ]
+    return [(f"route.GET {path}", f"{path}?month={month}") for path in paths]
+
+
+def _measure(call, iterations: int, warmup: int, reset=None) -> dict:
+    from extensions.sql_profiler import QueryProfile, bind_query_profile
+
+    durations: list[float] = []
+    query_counts: list[int] = []
+    for index in range(warmup + iterations):
+        if reset is not None:
+            reset()
+        profile = QueryProfile()
+        started_at = time.perf_counter()
+        with bind_query_profile(profile):
+            call()
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+        if index >= warmup:
+            durations.append(elapsed_ms)
+            query_counts.append(profile.count)
+
+    return {
+        "p50_ms": round(percentile(durations, 0.5), 3),
+        "p95_ms": round(percentile(durations, 0.95), 3),
+        "mean_ms": round(sum(durations) / len(durations), 3),
+        "min_ms": round(min(durations), 3),
+        "queries": max(query_counts),
+    }
+
+
+def _route_call(client, path: str):
+    def call():
+        response = client.get(path)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {path} returned {response.status_code}")
+
+    return call
+
+
+def run(args: argparse.Namespace, work_dir: Path) -> dict:
+    source = Path(args.db).resolve()
+    if not source.exists():
+        raise SystemExit(f"{source} does not exist, generate it with benchmarks.generate_ledger first")
+
+    pristine = work_dir / "pristine.db"
+    work = work_dir / "work.db"
+    _copy_database(source, pristine)
+    _copy_database(pristine, work)
+    use_database(work)
+
+    from extensions.database import close_pooled_connections, get_connection
+    from models.app_state import set_app_state
+    from models.data_version import clear_analytics_cache
+    from models.month_close import invalidate_month_snapshots
+    from models.subscription import CHARGE_SYNC_STATE_KEY, process_due_subscription_charges
+    from utils.date_utils import month_date_bounds
+
+    def restore_database():
+        close_pooled_connections()
+        _copy_database(pristine, work)
+
+    def reset_caches():
+        clear_analytics_cache()
+        with get_connection() as conn:
+            invalidate_month_snapshots(conn, [month])
+
+    with get_connection() as conn:
+        row = conn.execute("SELECT COUNT(*) AS total, MAX(month) AS last_month FROM transactions").fetchone()
+    month = args.month or row["last_month"] or date.today().strftime("%Y-%m")
+    as_of = month_date_bounds(month)[1]
+    reset = None if args.warm else reset_caches
+
+    results: dict[str, dict] = {}
+
+    def record(name: str, call, case_reset=None):
+        if args.filter and args.filter not in name:
+            return
+        results[name] = _measure(call, args.iterations, args.warmup, case_reset)
+        print(_format_row(name, results[name]), flush=True)
+
+    print(_format_header(), flush=True)
+    record(
+        "model.process_due_subscription_charges",
+        lambda: process_due_subscription_charges(as_of),
+        restore_database,
+    )
+    restore_database()
+    process_due_subscription_charges(as_of)
+    with get_connection() as conn:
+        set_app_state(conn, CHARGE_SYNC_STATE_KEY, date.today().isoformat())
+        conn.commit()
+
+    for name, call in _model_cases(month, as_of):
+        record(name, call, reset)
+
+    from app import app
+
+    client = app.test_client()
+    for name, path in _route_cases(month):
+        record(name, _route_call(client, path), reset)
+
+    close_pooled_connections()
+    return {
+        "meta": {
+            "db": args.db,
+            "transactions": int(row["total"]),
+            "month": month,
+            "as_of": as_of,
+            "iterations": args.iterations,
+            "warm": args.warm,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "created_at": date.today().isoformat(),
+        },
+        "results": results,
+    }
+
+
+def _format_header() -> str:
+    return f"{'case':<48} {'p50 ms':>10} {'p95 ms':>10} {'mean ms':>10} {'queries':>8}"
+
+
+def _format_row(name: str, result: dict) -> str:
+    return (
+        f"{name:<48} {result['p50_ms']:>10.2f} {result['p95_ms']:>10.2f} "
+        f"{result['mean_ms']:>10.2f} {result['queries']:>8}"
+    )
+
+
+def compare(baseline: dict, report: dict, tolerance: float) -> list[str]:
+    regressions = []
+    print(f"\n{'case':<48} {'base p50':>10} {'p50':>10} {'change':>8} {'queries':>10}")
+    for name, result in report["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            print(f"{name:<48} {'-':>10} {result['p50_ms']:>10.2f} {'new':>8} {result['queries']:>10}")
+            continue
+
+        change = (result["p50_ms"] - base["p50_ms"]) / base["p50_ms"] if base["p50_ms"] else 0.0
+        queries = f"{base['queries']}->{result['queries']}"
+        slower = change > tolerance and result["p50_ms"] - base["p50_ms"] > NOISE_FLOOR_MS
+        more_queries = result["queries"] > base["queries"]
+        flag = " !" if slower or more_queries else ""
+        print(f"{name:<48} {base['p50_ms']:>10.2f} {result['p50_ms']:>10.2f} {change:>+8.1%} {queries:>10}{flag}")
+        if slower or more_queries:
+            regressions.append(name)
+    return regressions
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark MoneyManager model functions and routes.")
+    parser.add_argument("--db", required=True, help="ledger generated by benchmarks.generate_ledger (left untouched)")
+    parser.add_argument("--month", help="month to benchmark (YYYY-MM), defaults to the latest month in the ledger")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--warm", action="store_true", help="keep analytics caches and month snapshots between iterations")
+    parser.add_argument("--filter", help="only run cases whose name contains this text")
+    parser.add_argument("--save", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", help="compare against a saved JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed p50 slowdown ratio")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    if args.iterations < 1:
+        raise SystemExit("--iterations must be at least 1")
+
+    with tempfile.TemporaryDirectory(prefix="moneymanager-bench-", ignore_cleanup_errors=True) as work_dir:
+        report = run(args, Path(work_dir))
+
+    if args.save:
+        Path(args.save).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.save).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\nbaseline saved to {args.save}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(baseline, report, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            if args.fail_on_regression:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
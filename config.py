@@ -1,8 +1,30 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent
-DB_DIR = BASE_DIR / "data"
-DB_PATH = DB_DIR / "money_manager.db"
+DB_PATH = Path(os.environ.get("MONEY_MANAGER_DB_PATH") or BASE_DIR / "data" / "money_manager.db")
+DB_DIR = DB_PATH.parent
+DB_POOL_SIZE = 4
+ANALYTICS_CACHE_SIZE = 64
+DASHBOARD_WORKERS = 4
+SQL_PROFILING_ENABLED = os.environ.get("MONEY_MANAGER_SQL_PROFILING", "").lower() in ("1", "true", "yes")
+SQL_REPEAT_WARNING_THRESHOLD = 10
+IMPORT_CHUNK_SIZE = 2000
+IMPORT_MAX_ERRORS = 500
+TRANSACTION_BATCH_MAX_ITEMS = 1000
+EXPORT_FETCH_SIZE = 500
+TRANSACTION_PAGE_DEFAULT_LIMIT = 50
+TRANSACTION_PAGE_MAX_LIMIT = 200
+MAX_AMOUNT = 100_000_000
+
+SQLITE_PRAGMAS = {
+    "busy_timeout": 5000,
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 64 * 1024 * 1024,
+    "cache_size": -16000,
+    "temp_store": "MEMORY",
+}
 
 CATEGORY_OPTIONS = [
     "餐饮",
@@ -28,6 +50,8 @@ TAG_OPTIONS = [
     "学习投资",
 ]
 
+SUBSCRIPTION_SYNC_RECHECK_SECONDS = 300
+
 SUBSCRIPTION_CYCLE_OPTIONS = [
     "monthly",
     "yearly",
@@ -1,153 +1,526 @@
 import os
+import queue
 import sqlite3
+import threading
 
-from config import DB_DIR, DB_PATH
+from flask import Flask, g, has_app_context
 
+from config import DB_DIR, DB_PATH, DB_POOL_SIZE, SQLITE_PRAGMAS
+from extensions.request_cache import clear_request_memo
+from extensions.sql_profiler import profiled_execute
 
-def get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
+_pool: queue.LifoQueue = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+_thread_state = threading.local()
+
+
+class ManagedConnection:
+    def __init__(self, conn: sqlite3.Connection, pooled: bool = False):
+        self.raw = conn
+        self.pooled = pooled
+        self._depth = 0
+
+    def __getattr__(self, name: str):
+        return getattr(self.raw, name)
+
+    def execute(self, sql: str, parameters=()):
+        return profiled_execute(self.raw.execute, sql, parameters)
+
+    def executemany(self, sql: str, parameters):
+        return profiled_execute(self.raw.executemany, sql, parameters)
+
+    def __enter__(self) -> "ManagedConnection":
+        self._depth += 1
+        if self.pooled and self._depth == 1:
+            _thread_state.connection = self
+        return self
+
+    def commit(self) -> None:
+        if self.raw.in_transaction:
+            clear_request_memo()
+        self.raw.commit()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._depth -= 1
+        if self._depth > 0:
+            return
+        if exc_type is None:
+            self.commit()
+        else:
+            self.raw.rollback()
+        if self.pooled:
+            if getattr(_thread_state, "connection", None) is self:
+                _thread_state.connection = None
+            _release_pooled_connection(self)
+
+
+def _open_connection() -> sqlite3.Connection:
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    for pragma, value in SQLITE_PRAGMAS.items():
+        conn.execute(f"PRAGMA {pragma} = {value}")
     return conn
 
 
-def init_db() -> None:
-    os.makedirs(DB_DIR, exist_ok=True)
+def _acquire_pooled_connection() -> ManagedConnection:
+    try:
+        return _pool.get_nowait()
+    except queue.Empty:
+        return ManagedConnection(_open_connection(), pooled=True)
 
-    with get_connection() as conn:
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS transactions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                amount REAL NOT NULL,
-                type TEXT CHECK(type IN ('income', 'expense')) NOT NULL,
-                date TEXT NOT NULL,
-                category_main TEXT NOT NULL,
-                category_sub TEXT,
-                tags TEXT,
-                note TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            );
-            """
-        )
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS budgets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                month TEXT NOT NULL,
-                category_main TEXT,
-                budget_amount REAL NOT NULL
-            );
-            """
-        )
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS ai_archives (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                month TEXT NOT NULL,
-                content TEXT NOT NULL,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            );
-            """
+
+def _release_pooled_connection(handle: ManagedConnection) -> None:
+    if handle.raw.in_transaction:
+        handle.raw.rollback()
+    try:
+        _pool.put_nowait(handle)
+    except queue.Full:
+        handle.raw.close()
+
+
+def close_pooled_connections() -> None:
+    while True:
+        try:
+            handle = _pool.get_nowait()
+        except queue.Empty:
+            return
+        handle.raw.close()
+
+
+def get_connection() -> ManagedConnection:
+    if has_app_context():
+        handle = g.get("_db_connection")
+        if handle is None:
+            handle = ManagedConnection(_open_connection())
+            g._db_connection = handle
+        return handle
+    handle = getattr(_thread_state, "connection", None)
+    if handle is not None:
+        return handle
+    return _acquire_pooled_connection()
+
+
+def close_request_connection(_exc: BaseException | None = None) -> None:
+    handle = g.pop("_db_connection", None)
+    if handle is None:
+        return
+    if handle.raw.in_transaction:
+        handle.raw.rollback()
+    handle.raw.close()
+
+
+def init_app(app: Flask) -> None:
+    app.teardown_appcontext(close_request_connection)
+
+
+INITIAL_TABLE_SCHEMAS = {
+    "transactions": """
+        CREATE TABLE IF NOT EXISTS {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            amount_cents INTEGER NOT NULL,
+            type TEXT CHECK(type IN ('income', 'expense')) NOT NULL,
+            date TEXT NOT NULL,
+            category_main TEXT NOT NULL,
+            category_sub TEXT,
+            note TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            month TEXT GENERATED ALWAYS AS (substr(date, 1, 7)) STORED
+        );
+    """,
+    "transaction_tags": """
+        CREATE TABLE IF NOT EXISTS {table} (
+            transaction_id INTEGER NOT NULL,
+            tag TEXT NOT NULL,
+            PRIMARY KEY (transaction_id, tag)
+        );
+    """,
+    "budgets": """
+        CREATE TABLE IF NOT EXISTS {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            month TEXT NOT NULL,
+            category_main TEXT,
+            budget_amount_cents INTEGER NOT NULL
+        );
+    """,
+    "ai_archives": """
+        CREATE TABLE IF NOT EXISTS {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            month TEXT NOT NULL,
+            content TEXT NOT NULL,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        );
+    """,
+    "subscriptions": """
+        CREATE TABLE IF NOT EXISTS {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            amount_cents INTEGER NOT NULL,
+            cycle TEXT CHECK(cycle IN ('monthly', 'yearly', 'weekly', 'quarterly')) NOT NULL,
+            next_billing_date TEXT NOT NULL,
+            category TEXT,
+            payment_method TEXT,
+            note TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        );
+    """,
+    "subscription_cancellations": """
+        CREATE TABLE IF NOT EXISTS {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            subscription_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            amount_cents INTEGER NOT NULL,
+            cycle TEXT NOT NULL,
+            next_billing_date TEXT NOT NULL,
+            category TEXT,
+            payment_method TEXT,
+            note TEXT,
+            cancelled_at TEXT DEFAULT CURRENT_TIMESTAMP
+        );
+    """,
+    "subscription_charges": """
+        CREATE TABLE IF NOT EXISTS {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            subscription_id INTEGER NOT NULL,
+            billing_date TEXT NOT NULL,
+            amount_cents INTEGER NOT NULL,
+            transaction_id INTEGER,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(subscription_id, billing_date)
+        );
+    """,
+    "goals": """
+        CREATE TABLE IF NOT EXISTS {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            target_amount_cents INTEGER NOT NULL,
+            deadline TEXT NOT NULL,
+            note TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        );
+    """,
+    "monthly_category_rollup": """
+        CREATE TABLE IF NOT EXISTS {table} (
+            month TEXT NOT NULL,
+            type TEXT NOT NULL,
+            category_main TEXT NOT NULL,
+            amount_cents INTEGER NOT NULL DEFAULT 0,
+            tx_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (month, type, category_main)
+        );
+    """,
+    "daily_rollup": """
+        CREATE TABLE IF NOT EXISTS {table} (
+            date TEXT PRIMARY KEY,
+            expense_cents INTEGER NOT NULL DEFAULT 0,
+            income_cents INTEGER NOT NULL DEFAULT 0,
+            expense_count INTEGER NOT NULL DEFAULT 0
+        );
+    """,
+}
+
+INITIAL_INDEX_STATEMENTS = [
+    """
+    CREATE INDEX IF NOT EXISTS idx_transactions_type_month_category
+    ON transactions (type, month, category_main)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_transactions_date_type
+    ON transactions (date, type)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_transaction_tags_tag
+    ON transaction_tags (tag, transaction_id)
+    """,
+]
+
+LEGACY_CENTS_COLUMNS = {
+    "transactions": ("amount", "amount_cents"),
+    "budgets": ("budget_amount", "budget_amount_cents"),
+    "subscriptions": ("amount", "amount_cents"),
+    "subscription_cancellations": ("amount", "amount_cents"),
+    "subscription_charges": ("amount", "amount_cents"),
+    "goals": ("target_amount", "target_amount_cents"),
+}
+
+
+DROPPED_COLUMNS = {
+    "transactions": ("tags", "payment_method"),
+}
+
+
+def _table_columns(conn, table: str) -> list[str]:
+    return [row["name"] for row in conn.execute(f"PRAGMA table_xinfo({table})").fetchall()]
+
+
+def _stored_columns(conn, table: str) -> list[str]:
+    return [
+        row["name"]
+        for row in conn.execute(f"PRAGMA table_xinfo({table})").fetchall()
+        if row["hidden"] not in (2, 3)
+    ]
+
+
+def _rebuild_table(conn, table: str) -> None:
+    current_columns = set(_table_columns(conn, table))
+    new_table = f"{table}_new"
+    conn.execute(INITIAL_TABLE_SCHEMAS[table].format(table=new_table))
+
+    legacy_column, cents_column = LEGACY_CENTS_COLUMNS.get(table, (None, None))
+    target_columns = _stored_columns(conn, new_table)
+    select_exprs = []
+    for column in target_columns:
+        if column in current_columns:
+            select_exprs.append(column)
+        elif column == cents_column and legacy_column in current_columns:
+            select_exprs.append(f"CAST(ROUND({legacy_column} * 100) AS INTEGER)")
+        else:
+            select_exprs.append("NULL")
+
+    conn.execute(
+        f"""
+        INSERT INTO {new_table} ({", ".join(target_columns)})
+        SELECT {", ".join(select_exprs)}
+        FROM {table}
+        """
+    )
+    sequence = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+    conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"ALTER TABLE {new_table} RENAME TO {table}")
+    if sequence is not None:
+        conn.execute("DELETE FROM sqlite_sequence WHERE name = ?", (table,))
+        conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (table, sequence["seq"]))
+
+
+def _needs_rebuild(conn, table: str) -> bool:
+    columns = set(_table_columns(conn, table))
+    if table == "transactions" and "month" not in columns:
+        return True
+    legacy_columns = set(DROPPED_COLUMNS.get(table, ()))
+    if table in LEGACY_CENTS_COLUMNS:
+        legacy_columns.add(LEGACY_CENTS_COLUMNS[table][0])
+    return bool(columns & legacy_columns)
+
+
+def refresh_cumulative_net(conn, from_date: str = "") -> None:
+    conn.execute("DELETE FROM daily_cumulative_net WHERE date >= ?", (from_date,))
+    conn.execute(
+        """
+        INSERT INTO daily_cumulative_net (date, cum_income_cents, cum_expense_cents)
+        SELECT
+            daily_rollup.date,
+            base.cum_income_cents + SUM(daily_rollup.income_cents) OVER (ORDER BY daily_rollup.date),
+            base.cum_expense_cents + SUM(daily_rollup.expense_cents) OVER (ORDER BY daily_rollup.date)
+        FROM daily_rollup, (
+            SELECT
+                COALESCE(
+                    (SELECT cum_income_cents FROM daily_cumulative_net WHERE date < ? ORDER BY date DESC LIMIT 1),
+                    0
+                ) AS cum_income_cents,
+                COALESCE(
+                    (SELECT cum_expense_cents FROM daily_cumulative_net WHERE date < ? ORDER BY date DESC LIMIT 1),
+                    0
+                ) AS cum_expense_cents
+        ) AS base
+        WHERE daily_rollup.date >= ?
+        """,
+        (from_date, from_date, from_date),
+    )
+
+
+def _rebuild_category_and_daily_rollups(conn) -> None:
+    conn.execute("DELETE FROM monthly_category_rollup")
+    conn.execute(
+        """
+        INSERT INTO monthly_category_rollup (month, type, category_main, amount_cents, tx_count)
+        SELECT month, type, category_main, SUM(amount_cents), COUNT(*)
+        FROM transactions
+        GROUP BY month, type, category_main
+        """
+    )
+    conn.execute("DELETE FROM daily_rollup")
+    conn.execute(
+        """
+        INSERT INTO daily_rollup (date, expense_cents, income_cents, expense_count)
+        SELECT
+            date,
+            SUM(CASE WHEN type = 'expense' THEN amount_cents ELSE 0 END),
+            SUM(CASE WHEN type = 'income' THEN amount_cents ELSE 0 END),
+            SUM(CASE WHEN type = 'expense' THEN 1 ELSE 0 END)
+        FROM transactions
+        GROUP BY date
+        """
+    )
+
+
+def rebuild_rollups(conn) -> None:
+    _rebuild_category_and_daily_rollups(conn)
+    refresh_cumulative_net(conn)
+
+
+def _migrate_create_tables(conn) -> None:
+    for table, schema in INITIAL_TABLE_SCHEMAS.items():
+        conn.execute(schema.format(table=table))
+
+
+def _migrate_transaction_tags(conn) -> None:
+    if "tags" not in _table_columns(conn, "transactions"):
+        return
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO transaction_tags (transaction_id, tag)
+        SELECT transactions.id, TRIM(tag_items.value)
+        FROM transactions, json_each(transactions.tags) AS tag_items
+        WHERE json_valid(transactions.tags)
+          AND json_type(transactions.tags) = 'array'
+          AND TRIM(tag_items.value) != ''
+        ORDER BY transactions.id, tag_items.key
+        """
+    )
+
+
+def _migrate_legacy_columns(conn) -> None:
+    for table in INITIAL_TABLE_SCHEMAS:
+        if _needs_rebuild(conn, table):
+            _rebuild_table(conn, table)
+
+
+def _migrate_initial_indexes(conn) -> None:
+    for statement in INITIAL_INDEX_STATEMENTS:
+        conn.execute(statement)
+
+
+def _migrate_rollups(conn) -> None:
+    _rebuild_category_and_daily_rollups(conn)
+
+
+def _migrate_app_state(conn) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS app_state (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
         )
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS subscriptions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                amount REAL NOT NULL,
-                cycle TEXT CHECK(cycle IN ('monthly', 'yearly', 'weekly', 'quarterly')) NOT NULL,
-                next_billing_date TEXT NOT NULL,
-                category TEXT,
-                payment_method TEXT,
-                note TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            );
-            """
+        """
+    )
+
+
+def _migrate_subscription_due_index(conn) -> None:
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_subscriptions_next_billing_date
+        ON subscriptions (next_billing_date)
+        """
+    )
+
+
+def _migrate_data_versions(conn) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS data_versions (
+            scope TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
         )
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS subscription_cancellations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                subscription_id INTEGER NOT NULL,
-                name TEXT NOT NULL,
-                amount REAL NOT NULL,
-                cycle TEXT NOT NULL,
-                next_billing_date TEXT NOT NULL,
-                category TEXT,
-                payment_method TEXT,
-                note TEXT,
-                cancelled_at TEXT DEFAULT CURRENT_TIMESTAMP
-            );
-            """
+        """
+    )
+
+
+def _migrate_month_snapshots(conn) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS month_closures (
+            month TEXT PRIMARY KEY,
+            reopened INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
         )
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS subscription_charges (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                subscription_id INTEGER NOT NULL,
-                billing_date TEXT NOT NULL,
-                amount REAL NOT NULL,
-                transaction_id INTEGER,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(subscription_id, billing_date)
-            );
-            """
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS month_snapshots (
+            month TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (month, kind)
         )
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS goals (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                target_amount REAL NOT NULL,
-                deadline TEXT NOT NULL,
-                note TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            );
-            """
+        """
+    )
+
+
+def _migrate_cumulative_net(conn) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS daily_cumulative_net (
+            date TEXT PRIMARY KEY,
+            cum_income_cents INTEGER NOT NULL,
+            cum_expense_cents INTEGER NOT NULL
         )
-        transaction_columns = {
-            row["name"] for row in conn.execute("PRAGMA table_info(transactions)").fetchall()
-        }
-        if "payment_method" in transaction_columns:
-            conn.executescript(
-                """
-                CREATE TABLE transactions_new (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    amount REAL NOT NULL,
-                    type TEXT CHECK(type IN ('income', 'expense')) NOT NULL,
-                    date TEXT NOT NULL,
-                    category_main TEXT NOT NULL,
-                    category_sub TEXT,
-                    tags TEXT,
-                    note TEXT,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                );
-
-                INSERT INTO transactions_new (
-                    id,
-                    amount,
-                    type,
-                    date,
-                    category_main,
-                    category_sub,
-                    tags,
-                    note,
-                    created_at
-                )
-                SELECT
-                    id,
-                    amount,
-                    type,
-                    date,
-                    category_main,
-                    category_sub,
-                    tags,
-                    note,
-                    created_at
-                FROM transactions;
-
-                DROP TABLE transactions;
-                ALTER TABLE transactions_new RENAME TO transactions;
-                """
+        """
+    )
+    refresh_cumulative_net(conn)
+
+
+def _migrate_transaction_page_indexes(conn) -> None:
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_transactions_date_id
+        ON transactions (date, id)
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_transactions_category_date_id
+        ON transactions (category_main, date, id)
+        """
+    )
+
+
+def _migrate_transaction_type_page_index(conn) -> None:
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_transactions_type_date_id
+        ON transactions (type, date, id)
+        """
+    )
+
+
+MIGRATIONS = [
+    _migrate_create_tables,
+    _migrate_transaction_tags,
+    _migrate_legacy_columns,
+    _migrate_initial_indexes,
+    _migrate_rollups,
+    _migrate_app_state,
+    _migrate_subscription_due_index,
+    _migrate_data_versions,
+    _migrate_month_snapshots,
+    _migrate_cumulative_net,
+    _migrate_transaction_page_indexes,
+    _migrate_transaction_type_page_index,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_schema_version(conn) -> int:
+    return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def init_db() -> None:
+    os.makedirs(DB_DIR, exist_ok=True)
+
+    with get_connection() as conn:
+        current_version = get_schema_version(conn)
+        if current_version > SCHEMA_VERSION:
+            raise RuntimeError(
+                f"database schema version {current_version} is newer than supported version {SCHEMA_VERSION}"
             )
-        conn.commit()
+
+        for version in range(current_version + 1, SCHEMA_VERSION + 1):
+            conn.execute("BEGIN IMMEDIATE")
+            if get_schema_version(conn) >= version:
+                conn.commit()
+                continue
+            MIGRATIONS[version - 1](conn)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
@@ -0,0 +1,72 @@
+import contextlib
+import functools
+from concurrent.futures import Future
+from contextvars import ContextVar
+
+from flask import g, has_app_context
+
+_bound_memo: ContextVar[dict | None] = ContextVar("bound_request_memo", default=None)
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+
+def current_request_memo() -> dict | None:
+    memo = _bound_memo.get()
+    if memo is not None:
+        return memo
+    if has_app_context():
+        return g.setdefault("_request_memo", {})
+    return None
+
+
+@contextlib.contextmanager
+def bind_request_memo(memo: dict | None):
+    token = _bound_memo.set(memo)
+    try:
+        yield
+    finally:
+        _bound_memo.reset(token)
+
+
+def request_memoized(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        memo = current_request_memo()
+        if memo is None:
+            return func(*args, **kwargs)
+
+        key = (func.__module__, func.__qualname__, _freeze(args), _freeze(kwargs))
+        pending = memo.get(key)
+        if pending is not None:
+            return pending.result()
+
+        future = Future()
+        pending = memo.setdefault(key, future)
+        if pending is not future:
+            return pending.result()
+
+        try:
+            value = func(*args, **kwargs)
+        except BaseException as exc:
+            if memo.get(key) is future:
+                memo.pop(key, None)
+            future.set_exception(exc)
+            raise
+        future.set_result(value)
+        return value
+
+    return wrapper
+
+
+def clear_request_memo() -> None:
+    memo = _bound_memo.get()
+    if memo is not None:
+        memo.clear()
+    if has_app_context():
+        g.pop("_request_memo", None)
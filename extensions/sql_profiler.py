@@ -0,0 +1,179 @@
+import contextlib
+import json
+import re
+import threading
+import time
+from contextvars import ContextVar
+
+from flask import Flask, current_app, g, has_app_context, request
+
+from config import SQL_PROFILING_ENABLED, SQL_REPEAT_WARNING_THRESHOLD
+
+_bound_profile: ContextVar["QueryProfile | None"] = ContextVar("bound_query_profile", default=None)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    text = _STRING_LITERAL.sub("?", sql)
+    text = _NUMBER_LITERAL.sub("?", text)
+    text = _WHITESPACE.sub(" ", text).strip()
+    return _PLACEHOLDER_LIST.sub("(?, ...)", text)
+
+
+class QueryProfile:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.duration_ms = 0.0
+        self.statements: dict[str, dict] = {}
+
+    def record(self, sql: str, duration_ms: float) -> None:
+        statement = normalize_sql(sql)
+        with self._lock:
+            self.count += 1
+            self.duration_ms += duration_ms
+            entry = self.statements.setdefault(statement, {"count": 0, "duration_ms": 0.0})
+            entry["count"] += 1
+            entry["duration_ms"] += duration_ms
+
+    def add_duration(self, sql: str, duration_ms: float) -> None:
+        statement = normalize_sql(sql)
+        with self._lock:
+            self.duration_ms += duration_ms
+            entry = self.statements.setdefault(statement, {"count": 0, "duration_ms": 0.0})
+            entry["duration_ms"] += duration_ms
+
+    def repeated_statements(self, threshold: int) -> list[dict]:
+        with self._lock:
+            return [
+                {"sql": statement, "count": entry["count"], "duration_ms": round(entry["duration_ms"], 3)}
+                for statement, entry in sorted(self.statements.items(), key=lambda item: -item[1]["count"])
+                if entry["count"] > threshold
+            ]
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "count": self.count,
+                "duration_ms": round(self.duration_ms, 3),
+                "statements": [
+                    {"sql": statement, "count": entry["count"], "duration_ms": round(entry["duration_ms"], 3)}
+                    for statement, entry in sorted(self.statements.items(), key=lambda item: -item[1]["duration_ms"])
+                ],
+            }
+
+
+class InstrumentedCursor:
+    def __init__(self, cursor, sql: str, profile: QueryProfile):
+        self._cursor = cursor
+        self._sql = sql
+        self._profile = profile
+
+    def __getattr__(self, name: str):
+        return getattr(self._cursor, name)
+
+    def _timed_fetch(self, fetch, *args):
+        started_at = time.perf_counter()
+        try:
+            return fetch(*args)
+        finally:
+            self._profile.add_duration(self._sql, (time.perf_counter() - started_at) * 1000)
+
+    def fetchone(self):
+        return self._timed_fetch(self._cursor.fetchone)
+
+    def fetchmany(self, *args):
+        return self._timed_fetch(self._cursor.fetchmany, *args)
+
+    def fetchall(self):
+        return self._timed_fetch(self._cursor.fetchall)
+
+    def __iter__(self):
+        while True:
+            rows = self.fetchmany(self._cursor.arraysize or 100)
+            if not rows:
+                return
+            yield from rows
+
+
+def current_query_profile() -> QueryProfile | None:
+    profile = _bound_profile.get()
+    if profile is not None:
+        return profile
+    if has_app_context():
+        return g.get("_query_profile")
+    return None
+
+
+@contextlib.contextmanager
+def bind_query_profile(profile: QueryProfile | None):
+    token = _bound_profile.set(profile)
+    try:
+        yield
+    finally:
+        _bound_profile.reset(token)
+
+
+def profiled_execute(execute, sql: str, parameters=()):
+    profile = current_query_profile()
+    if profile is None:
+        return execute(sql, parameters)
+
+    started_at = time.perf_counter()
+    cursor = execute(sql, parameters)
+    profile.record(sql, (time.perf_counter() - started_at) * 1000)
+    return InstrumentedCursor(cursor, sql, profile)
+
+
+def _server_timing_header(profile: QueryProfile) -> str:
+    entries = [f'db;dur={profile.duration_ms:.2f};desc="{profile.count} queries"']
+    for name, duration_ms in (g.get("dashboard_widget_timings") or {}).items():
+        entries.append(f"widget-{name};dur={duration_ms:.2f}")
+    return ", ".join(entries)
+
+
+def _start_query_profile() -> None:
+    g._query_profile = QueryProfile()
+
+
+def _report_query_profile(response):
+    profile = g.get("_query_profile")
+    if profile is None:
+        return response
+
+    response.headers.add("Server-Timing", _server_timing_header(profile))
+
+    summary = profile.summary()
+    current_app.logger.info(
+        "sql_profile %s",
+        json.dumps(
+            {
+                "method": request.method,
+                "path": request.path,
+                "endpoint": request.endpoint,
+                "status": response.status_code,
+                "query_count": summary["count"],
+                "query_ms": summary["duration_ms"],
+                "statements": summary["statements"][:5],
+            },
+            ensure_ascii=False,
+        ),
+    )
+
+    for statement in profile.repeated_statements(SQL_REPEAT_WARNING_THRESHOLD):
+        current_app.logger.warning(
+            "sql_repeated_statement %s",
+            json.dumps({"path": request.path, "endpoint": request.endpoint, **statement}, ensure_ascii=False),
+        )
+    return response
+
+
+def init_app(app: Flask) -> None:
+    if not SQL_PROFILING_ENABLED:
+        return
+    app.before_request(_start_query_profile)
+    app.after_request(_report_query_profile)
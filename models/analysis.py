@@ -3,10 +3,21 @@ from calendar import monthrange
 
 from extensions.database import get_connection
 from models.budget import get_budget_execution, get_budget_health_profile
+from models.data_version import SUBSCRIPTIONS_SCOPE, data_versioned
+from models.month_close import month_snapshotted
 from models.subscription import get_subscription_monthly_metrics, get_subscription_monthly_recap
-from models.transaction import get_monthly_stats, get_transactions_by_month
+from models.snapshot import MonthSnapshot, get_month_snapshot
+from models.transaction import get_monthly_stats
 from utils.date_utils import month_sequence
-from utils.trend_utils import parse_tags
+from utils.math_utils import from_cents
+
+
+def _insights_scopes(month: str) -> list[str]:
+    return [*month_sequence(month, count=3), SUBSCRIPTIONS_SCOPE]
+
+
+def _analysis_dashboard_scopes(month: str) -> list[str]:
+    return [*month_sequence(month, count=6), SUBSCRIPTIONS_SCOPE]
 
 
 def _clamp_score(value: float) -> float:
@@ -27,7 +38,7 @@ def _calculate_consumption_health(
     month: str,
     total_expense: float,
     daily_expense: list[dict],
-    records: list[dict],
+    snapshot: MonthSnapshot,
     category_stats: list[dict],
     impulsive_amount: float,
     learning_amount: float,
@@ -66,13 +77,7 @@ def _calculate_consumption_health(
     impulsive_ratio = (impulsive_amount / total_expense * 100) if total_expense > 0 else 0.0
     impulsive_score = _clamp_score((40 - impulsive_ratio) / 40 * 100)
 
-    rigid_amount = 0.0
-    for record in records:
-        if record.get("type") != "expense":
-            continue
-        tags = set(record.get("tags", []))
-        if "刚需" in tags:
-            rigid_amount += float(record.get("amount") or 0)
+    rigid_amount = snapshot.tagged_expense(["刚需"])
 
     rigid_ratio = (rigid_amount / total_expense * 100) if total_expense > 0 else 0.0
     non_rigid_ratio = 100 - rigid_ratio if total_expense > 0 else 0.0
@@ -162,7 +167,7 @@ def _calculate_consumption_health(
 def _build_consumption_persona(
     month: str,
     total_expense: float,
-    records: list[dict],
+    snapshot: MonthSnapshot,
     monthly_stats: dict,
     month_total_map: dict[str, float],
     consumption_health: dict,
@@ -211,15 +216,7 @@ def _build_consumption_persona(
 
     social_tag_set = {"社交", "人情", "聚会", "请客", "社交活动"}
     social_category_keywords = ("社交", "聚会", "娱乐", "餐饮", "人情")
-    social_amount = 0.0
-    for row in records:
-        if row.get("type") != "expense":
-            continue
-        amount = float(row.get("amount") or 0)
-        tags = set(row.get("tags", []))
-        category_name = str(row.get("category_main") or "")
-        if tags.intersection(social_tag_set) or any(keyword in category_name for keyword in social_category_keywords):
-            social_amount += amount
+    social_amount = snapshot.tagged_expense(social_tag_set, social_category_keywords)
     social_ratio = (social_amount / total_expense * 100) if total_expense > 0 else 0.0
 
     persona_scores = {
@@ -344,6 +341,7 @@ def _build_risk_radar(consumption_health: dict, subscription_ratio: float) -> di
     }
 
 
+@data_versioned(_insights_scopes)
 def get_monthly_insights(month: str) -> dict:
     monthly_stats = get_monthly_stats(month)
     total_expense = monthly_stats["total_expense"]
@@ -357,26 +355,10 @@ def get_monthly_insights(month: str) -> dict:
         if daily_avg > 0 and item["amount"] > daily_avg * 2
     ]
 
-    months = month_sequence(month, count=3)
-    with get_connection() as conn:
-        rows = conn.execute(
-            """
-            SELECT substr(date, 1, 7) AS month, category_main, amount
-            FROM transactions
-            WHERE type = 'expense' AND substr(date, 1, 7) IN (?, ?, ?)
-            """,
-            (months[0], months[1], months[2]),
-        ).fetchall()
-
-    month_total_map = {key: 0.0 for key in months}
-    month_category_map: dict[str, dict[str, float]] = {key: {} for key in months}
-    for row in rows:
-        m = row["month"]
-        category = row["category_main"] or "其他"
-        amount = float(row["amount"])
-        month_total_map[m] = round(month_total_map.get(m, 0) + amount, 2)
-        existing = month_category_map[m].get(category, 0.0)
-        month_category_map[m][category] = round(existing + amount, 2)
+    snapshot = get_month_snapshot(month)
+    months = snapshot.months
+    month_total_map = snapshot.window_expense_amounts()
+    month_category_map = snapshot.window_category_amounts()
 
     all_categories = set()
     for value in month_category_map.values():
@@ -402,18 +384,8 @@ def get_monthly_insights(month: str) -> dict:
                 }
             )
 
-    records = get_transactions_by_month(month)
-    impulsive_amount = 0.0
-    learning_amount = 0.0
-    for record in records:
-        if record["type"] != "expense":
-            continue
-        tags = set(record["tags"])
-        amount = float(record["amount"])
-        if "冲动" in tags:
-            impulsive_amount += amount
-        if "学习投资" in tags or "投资自己" in tags:
-            learning_amount += amount
+    impulsive_amount = snapshot.tagged_expense(["冲动"])
+    learning_amount = snapshot.tagged_expense(["学习投资", "投资自己"])
 
     impulsive_ratio = (impulsive_amount / total_expense * 100) if total_expense > 0 else 0
     learning_ratio = (learning_amount / total_expense * 100) if total_expense > 0 else 0
@@ -421,7 +393,7 @@ def get_monthly_insights(month: str) -> dict:
         month=month,
         total_expense=float(total_expense or 0),
         daily_expense=monthly_stats.get("daily_expense", []),
-        records=records,
+        snapshot=snapshot,
         category_stats=monthly_stats.get("category_stats", []),
         impulsive_amount=float(impulsive_amount),
         learning_amount=float(learning_amount),
@@ -435,7 +407,7 @@ def get_monthly_insights(month: str) -> dict:
     consumption_persona = _build_consumption_persona(
         month=month,
         total_expense=float(total_expense or 0),
-        records=records,
+        snapshot=snapshot,
         monthly_stats=monthly_stats,
         month_total_map=month_total_map,
         consumption_health=consumption_health,
@@ -460,12 +432,15 @@ def get_monthly_insights(month: str) -> dict:
     }
 
 
+@month_snapshotted("analysis_dashboard")
+@data_versioned(_analysis_dashboard_scopes)
 def get_analysis_dashboard_data(month: str) -> dict:
     monthly_stats = get_monthly_stats(month)
     insights = get_monthly_insights(month)
     subscription_metrics = get_subscription_monthly_metrics(month)
     budget_health = get_budget_health_profile(month)
-    months = month_sequence(month, count=3)
+    snapshot = get_month_snapshot(month)
+    months = snapshot.months
 
     total_expense = float(monthly_stats.get("total_expense", 0) or 0)
     total_income = float(monthly_stats.get("total_income", 0) or 0)
@@ -491,70 +466,37 @@ def get_analysis_dashboard_data(month: str) -> dict:
             f"建议优先控制高频非刚需消费。"
         )
 
-    expense_records = [
-        item for item in get_transactions_by_month(month) if item.get("type") == "expense"
-    ]
-    frequency_count = len(expense_records)
+    frequency_count = sum(snapshot.category_counts.values())
     avg_amount = (total_expense / frequency_count) if frequency_count > 0 else 0.0
 
-    category_count_map: dict[str, int] = {}
-    category_amount_map: dict[str, float] = {}
+    category_amount_map = snapshot.category_amounts()
     tag_focus = ["冲动", "刚需", "投资自己", "情绪消费"]
-    tag_amount_map: dict[str, float] = {key: 0.0 for key in tag_focus}
-    for row in expense_records:
-        category = row.get("category_main") or "其他"
-        amount = float(row.get("amount") or 0)
-        category_count_map[category] = category_count_map.get(category, 0) + 1
-        category_amount_map[category] = round(category_amount_map.get(category, 0) + amount, 2)
-        for tag in row.get("tags", []):
-            if tag in tag_amount_map:
-                tag_amount_map[tag] = round(tag_amount_map.get(tag, 0) + amount, 2)
 
     high_frequency_categories = []
-    for category, count in sorted(category_count_map.items(), key=lambda item: item[1], reverse=True)[:3]:
+    for category, count in sorted(snapshot.category_counts.items(), key=lambda item: item[1], reverse=True)[:3]:
         high_frequency_categories.append(
             {
                 "name": category,
                 "count": count,
-                "amount": round(category_amount_map.get(category, 0), 2),
+                "amount": category_amount_map.get(category, 0.0),
             }
         )
 
+    month_tag_amount_map = {m: snapshot.tag_amounts(m) for m in months}
+    tag_amount_map = month_tag_amount_map[month]
     this_month_tag_stats = []
     for tag in tag_focus:
-        amount = round(tag_amount_map.get(tag, 0), 2)
+        amount = round(tag_amount_map.get(tag, 0.0), 2)
         ratio = (amount / total_expense * 100) if total_expense > 0 else 0
         this_month_tag_stats.append({"name": tag, "amount": amount, "ratio": round(ratio, 2)})
 
-    with get_connection() as conn:
-        rows = conn.execute(
-            """
-            SELECT substr(date, 1, 7) AS month, amount, category_main, tags
-            FROM transactions
-            WHERE type = 'expense' AND substr(date, 1, 7) IN (?, ?, ?)
-            """,
-            (months[0], months[1], months[2]),
-        ).fetchall()
-
-    month_total_map: dict[str, float] = {m: 0.0 for m in months}
-    month_category_amount_map: dict[str, dict[str, float]] = {m: {} for m in months}
-    month_tag_amount_map: dict[str, dict[str, float]] = {m: {} for m in months}
-    for row in rows:
-        m = row["month"]
-        amount = float(row["amount"] or 0)
-        category = row["category_main"] or "其他"
-        month_total_map[m] = round(month_total_map.get(m, 0) + amount, 2)
-        month_category_amount_map[m][category] = round(
-            month_category_amount_map[m].get(category, 0) + amount, 2
-        )
-
-        for tag in parse_tags(row["tags"]):
-            month_tag_amount_map[m][tag] = round(month_tag_amount_map[m].get(tag, 0) + amount, 2)
-
-    category_totals: dict[str, float] = {}
-    for m in months:
-        for category, amount in month_category_amount_map[m].items():
-            category_totals[category] = round(category_totals.get(category, 0) + amount, 2)
+    month_total_map = snapshot.window_expense_amounts()
+    month_category_amount_map = snapshot.window_category_amounts()
+    category_total_cents: dict[str, int] = {}
+    for value in snapshot.window_category_cents.values():
+        for category, cents in value.items():
+            category_total_cents[category] = category_total_cents.get(category, 0) + cents
+    category_totals = {category: from_cents(cents) for category, cents in category_total_cents.items()}
 
     top_categories = [
         category for category, _amount in sorted(category_totals.items(), key=lambda x: x[1], reverse=True)[:6]
@@ -743,6 +685,7 @@ def get_ai_archives(month: str, limit: int = 10) -> list[dict]:
     return [dict(row) for row in rows]
 
 
+@month_snapshotted("ai_monthly_package")
 def get_ai_monthly_package(month: str) -> dict:
     insights = get_monthly_insights(month)
     return {
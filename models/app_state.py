@@ -0,0 +1,20 @@
+def get_app_state(conn, key: str) -> str | None:
+    row = conn.execute("SELECT value FROM app_state WHERE key = ?", (key,)).fetchone()
+    return row["value"] if row else None
+
+
+def set_app_state(conn, key: str, value: str) -> None:
+    conn.execute(
+        """
+        INSERT INTO app_state (key, value)
+        VALUES (?, ?)
+        ON CONFLICT(key) DO UPDATE SET
+            value = excluded.value,
+            updated_at = CURRENT_TIMESTAMP
+        """,
+        (key, value),
+    )
+
+
+def delete_app_state(conn, key: str) -> None:
+    conn.execute("DELETE FROM app_state WHERE key = ?", (key,))
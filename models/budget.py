@@ -1,10 +1,13 @@
 from statistics import mean
 
 from extensions.database import get_connection
+from models.data_version import bump_data_versions
+from models.rollup import get_month_category_amounts_by_month, get_month_totals
+from models.snapshot import get_month_snapshot
 from models.subscription import get_subscription_monthly_metrics
 from models.transaction import get_month_expense_by_category
-from models.transaction import get_transactions_by_month
 from utils.date_utils import month_sequence
+from utils.math_utils import from_cents, to_cents
 
 
 def upsert_budget(month: str, category_main: str | None, budget_amount: float) -> int:
@@ -22,11 +25,12 @@ def upsert_budget(month: str, category_main: str | None, budget_amount: float) -
 
         cursor = conn.execute(
             """
-            INSERT INTO budgets (month, category_main, budget_amount)
+            INSERT INTO budgets (month, category_main, budget_amount_cents)
             VALUES (?, ?, ?)
             """,
-            (month, category_main, float(budget_amount)),
+            (month, category_main, to_cents(budget_amount)),
         )
+        bump_data_versions(conn, [month])
         conn.commit()
         last_row_id = cursor.lastrowid
         if last_row_id is None:
@@ -38,7 +42,7 @@ def get_budget_execution(month: str) -> dict:
     with get_connection() as conn:
         budget_rows = conn.execute(
             """
-            SELECT id, month, category_main, budget_amount
+            SELECT id, month, category_main, budget_amount_cents
             FROM budgets
             WHERE month = ?
             ORDER BY category_main IS NULL DESC, category_main ASC
@@ -52,7 +56,7 @@ def get_budget_execution(month: str) -> dict:
     items = []
     for row in budget_rows:
         category = row["category_main"]
-        budget_amount = float(row["budget_amount"])
+        budget_amount = from_cents(row["budget_amount_cents"])
         actual = total_expense if category is None else category_expense.get(category, 0.0)
         execution_rate = round((actual / budget_amount * 100), 2) if budget_amount > 0 else 0.0
 
@@ -91,7 +95,7 @@ def _build_budget_month_map(months: list[str]) -> dict[str, float]:
     with get_connection() as conn:
         rows = conn.execute(
             f"""
-            SELECT month, budget_amount
+            SELECT month, budget_amount_cents
             FROM budgets
             WHERE category_main IS NULL
               AND month IN ({placeholders})
@@ -101,7 +105,7 @@ def _build_budget_month_map(months: list[str]) -> dict[str, float]:
 
     month_budget_map = {m: 0.0 for m in months}
     for row in rows:
-        month_budget_map[row["month"]] = round(float(row["budget_amount"] or 0), 2)
+        month_budget_map[row["month"]] = from_cents(row["budget_amount_cents"])
     return month_budget_map
 
 
@@ -156,14 +160,7 @@ def _calculate_subscription_component(month: str, total_expense: float) -> dict:
 
 
 def _calculate_impulsive_component(month: str, total_expense: float) -> dict:
-    expense_records = [
-        item for item in get_transactions_by_month(month) if item.get("type") == "expense"
-    ]
-    impulsive_amount = 0.0
-    for item in expense_records:
-        tags = set(item.get("tags") or [])
-        if "冲动" in tags:
-            impulsive_amount += float(item.get("amount") or 0)
+    impulsive_amount = get_month_snapshot(month).tagged_expense(["冲动"])
 
     impulsive_ratio = round((impulsive_amount / total_expense * 100), 2) if total_expense > 0 else 0.0
     score = round(100 - _clamp(impulsive_ratio * 2.0, 0, 100), 2)
@@ -204,23 +201,12 @@ def _build_category_risks(month: str, execution_items: list[dict]) -> dict:
     unreasonable_budget = []
     months = month_sequence(month, count=4)
     history_months = [m for m in months if m != month]
-    placeholders = ",".join("?" for _ in history_months)
-    with get_connection() as conn:
-        history_rows = conn.execute(
-            f"""
-            SELECT substr(date, 1, 7) AS month, category_main, ROUND(SUM(amount), 2) AS amount
-            FROM transactions
-            WHERE type = 'expense'
-              AND substr(date, 1, 7) IN ({placeholders})
-            GROUP BY substr(date, 1, 7), category_main
-            """,
-            tuple(history_months),
-        ).fetchall()
+    history_category_map = get_month_category_amounts_by_month(history_months)
 
     category_history_map: dict[str, list[float]] = {}
-    for row in history_rows:
-        category = row["category_main"] or "其他"
-        category_history_map.setdefault(category, []).append(float(row["amount"] or 0))
+    for m in history_months:
+        for category, amount in history_category_map[m].items():
+            category_history_map.setdefault(category or "其他", []).append(amount)
 
     for item in category_items:
         category = item["category_main"]
@@ -312,21 +298,8 @@ def get_budget_health_profile(month: str) -> dict:
 
     months = month_sequence(month, count=6)
     month_budget_map = _build_budget_month_map(months)
-    monthly_expense_map = {m: 0.0 for m in months}
-    with get_connection() as conn:
-        expense_rows = conn.execute(
-            """
-            SELECT substr(date, 1, 7) AS month, ROUND(SUM(amount), 2) AS total_expense
-            FROM transactions
-            WHERE type = 'expense'
-              AND substr(date, 1, 7) IN (?, ?, ?, ?, ?, ?)
-            GROUP BY substr(date, 1, 7)
-            """,
-            tuple(months),
-        ).fetchall()
-
-    for row in expense_rows:
-        monthly_expense_map[row["month"]] = round(float(row["total_expense"] or 0), 2)
+    month_totals = get_month_totals(months)
+    monthly_expense_map = {m: month_totals[m]["expense"] for m in months}
 
     execution_trend = []
     for m in months:
@@ -0,0 +1,74 @@
+import copy
+import functools
+import threading
+from collections import OrderedDict
+
+from config import ANALYTICS_CACHE_SIZE
+from extensions.database import get_connection
+from models.month_close import invalidate_month_snapshots
+
+SUBSCRIPTIONS_SCOPE = "subscriptions"
+GOALS_SCOPE = "goals"
+GLOBAL_SCOPES = {SUBSCRIPTIONS_SCOPE, GOALS_SCOPE}
+
+_cache_lock = threading.Lock()
+_cache: OrderedDict = OrderedDict()
+
+
+def bump_data_versions(conn, scopes) -> None:
+    conn.executemany(
+        """
+        INSERT INTO data_versions (scope, version)
+        VALUES (?, 1)
+        ON CONFLICT(scope) DO UPDATE SET version = version + 1
+        """,
+        [(scope,) for scope in sorted(set(scopes))],
+    )
+    invalidate_month_snapshots(conn, [scope for scope in scopes if scope not in GLOBAL_SCOPES])
+
+
+def get_data_versions(scopes: list[str]) -> tuple[int, ...]:
+    placeholders = ",".join("?" for _ in scopes)
+    with get_connection() as conn:
+        rows = conn.execute(
+            f"SELECT scope, version FROM data_versions WHERE scope IN ({placeholders})",
+            tuple(scopes),
+        ).fetchall()
+
+    version_map = {row["scope"]: int(row["version"]) for row in rows}
+    return tuple(version_map.get(scope, 0) for scope in scopes)
+
+
+def get_data_revision() -> int:
+    with get_connection() as conn:
+        row = conn.execute("SELECT COALESCE(SUM(version), 0) AS revision FROM data_versions").fetchone()
+    return int(row["revision"])
+
+
+def clear_analytics_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+
+
+def data_versioned(scopes_for):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(month: str):
+            key = (func.__module__, func.__qualname__, month, get_data_versions(scopes_for(month)))
+            with _cache_lock:
+                if key in _cache:
+                    _cache.move_to_end(key)
+                    return copy.deepcopy(_cache[key])
+
+            result = func(month)
+            with _cache_lock:
+                _cache[key] = result
+                _cache.move_to_end(key)
+                while len(_cache) > ANALYTICS_CACHE_SIZE:
+                    _cache.popitem(last=False)
+            return copy.deepcopy(result)
+
+        return wrapper
+
+    return decorator
+
@@ -1,18 +1,22 @@
 from datetime import date
 
 from extensions.database import get_connection
+from models.data_version import GOALS_SCOPE, bump_data_versions
+from models.net_flow import get_cumulative_before, net_flow_boundaries, net_flow_cents
 from utils.date_utils import parse_date
+from utils.math_utils import from_cents, to_cents
 
 
 def create_goal(name: str, target_amount: float, deadline: str, note: str = "") -> int:
     with get_connection() as conn:
         cursor = conn.execute(
             """
-            INSERT INTO goals (name, target_amount, deadline, note)
+            INSERT INTO goals (name, target_amount_cents, deadline, note)
             VALUES (?, ?, ?, ?)
             """,
-            (name.strip(), float(target_amount), deadline, note.strip()),
+            (name.strip(), to_cents(target_amount), deadline, note.strip()),
         )
+        bump_data_versions(conn, [GOALS_SCOPE])
         conn.commit()
         last_row_id = cursor.lastrowid
         if last_row_id is None:
@@ -24,33 +28,23 @@ def get_all_goals() -> list[dict]:
     with get_connection() as conn:
         rows = conn.execute(
             """
-            SELECT id, name, target_amount, deadline, note, created_at
+            SELECT id, name, target_amount_cents, deadline, note, created_at
             FROM goals
             ORDER BY deadline ASC, created_at DESC
             """
         ).fetchall()
 
-    return [dict(row) for row in rows]
+    goals = []
+    for row in rows:
+        item = dict(row)
+        item["target_amount"] = from_cents(item.pop("target_amount_cents"))
+        goals.append(item)
+    return goals
 
 
-def _sum_savings_in_period(start_date: date, end_date: date) -> float:
-    with get_connection() as conn:
-        row = conn.execute(
-            """
-            SELECT ROUND(
-                COALESCE(SUM(CASE WHEN type = 'income' THEN amount ELSE 0 END), 0)
-                - COALESCE(SUM(CASE WHEN type = 'expense' THEN amount ELSE 0 END), 0),
-                2
-            ) AS net_saving
-            FROM transactions
-            WHERE date >= ? AND date <= ?
-            """,
-            (start_date.isoformat(), end_date.isoformat()),
-        ).fetchone()
-
-    if not row:
-        return 0.0
-    return round(float(row["net_saving"] or 0), 2)
+def _sum_savings_in_period(cumulative: dict[str, tuple[int, int]], start_date: date, end_date: date) -> float:
+    income_cents, expense_cents = net_flow_cents(cumulative, start_date.isoformat(), end_date.isoformat())
+    return from_cents(income_cents - expense_cents)
 
 
 def _months_remaining(today: date, deadline: date) -> int:
@@ -61,13 +55,17 @@ def _months_remaining(today: date, deadline: date) -> int:
     return max(1, month_diff + 1)
 
 
-def _build_goal_progress_item(goal_row: dict, today: date) -> dict:
+def _goal_start_date(goal_row: dict, today: date) -> date:
+    return parse_date(str(goal_row.get("created_at") or "")[:10]) or today
+
+
+def _build_goal_progress_item(goal_row: dict, today: date, cumulative: dict[str, tuple[int, int]]) -> dict:
     created_at = str(goal_row.get("created_at") or "")
-    start_date = parse_date(created_at[:10]) or today
+    start_date = _goal_start_date(goal_row, today)
     deadline = parse_date(str(goal_row.get("deadline") or "")) or today
 
     target_amount = round(float(goal_row.get("target_amount") or 0), 2)
-    net_saving = _sum_savings_in_period(start_date, today)
+    net_saving = _sum_savings_in_period(cumulative, start_date, today)
     current_saved = max(0.0, round(net_saving, 2))
 
     progress_rate = round((current_saved / target_amount * 100), 2) if target_amount > 0 else 0.0
@@ -106,4 +104,11 @@ def _build_goal_progress_item(goal_row: dict, today: date) -> dict:
 def get_goal_progress_list(today: date | None = None) -> list[dict]:
     current_day = today or date.today()
     goals = get_all_goals()
-    return [_build_goal_progress_item(goal, current_day) for goal in goals]
+    if not goals:
+        return []
+
+    boundaries: list[str] = []
+    for goal in goals:
+        boundaries.extend(net_flow_boundaries(_goal_start_date(goal, current_day).isoformat(), current_day.isoformat()))
+    cumulative = get_cumulative_before(boundaries)
+    return [_build_goal_progress_item(goal, current_day, cumulative) for goal in goals]
@@ -0,0 +1,111 @@
+import functools
+import json
+from datetime import date
+
+from extensions.database import get_connection
+from utils.date_utils import parse_date
+
+
+def current_month() -> str:
+    return date.today().strftime("%Y-%m")
+
+
+def is_closable_month(month: str) -> bool:
+    return len(month) == 7 and parse_date(f"{month}-01") is not None and month < current_month()
+
+
+def _is_month_reopened(conn, month: str) -> bool:
+    row = conn.execute("SELECT reopened FROM month_closures WHERE month = ?", (month,)).fetchone()
+    return bool(row and row["reopened"])
+
+
+def is_month_closed(month: str) -> bool:
+    if not is_closable_month(month):
+        return False
+    with get_connection() as conn:
+        return not _is_month_reopened(conn, month)
+
+
+def close_month(month: str) -> dict:
+    with get_connection() as conn:
+        conn.execute(
+            """
+            INSERT INTO month_closures (month, reopened)
+            VALUES (?, 0)
+            ON CONFLICT(month) DO UPDATE SET
+                reopened = 0,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            (month,),
+        )
+        conn.commit()
+    return {"month": month, "closed": True}
+
+
+def reopen_month(month: str) -> dict:
+    with get_connection() as conn:
+        conn.execute(
+            """
+            INSERT INTO month_closures (month, reopened)
+            VALUES (?, 1)
+            ON CONFLICT(month) DO UPDATE SET
+                reopened = 1,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            (month,),
+        )
+        conn.execute("DELETE FROM month_snapshots WHERE month = ?", (month,))
+        conn.commit()
+    return {"month": month, "closed": False}
+
+
+def _month_data_revision(conn, month: str) -> int:
+    row = conn.execute(
+        "SELECT COALESCE(SUM(version), 0) AS revision FROM data_versions WHERE scope <= ?",
+        (month,),
+    ).fetchone()
+    return int(row["revision"])
+
+
+def invalidate_month_snapshots(conn, months: list[str]) -> None:
+    if months:
+        conn.execute("DELETE FROM month_snapshots WHERE month >= ?", (min(months),))
+
+
+def month_snapshotted(kind: str):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(month: str):
+            if not is_closable_month(month):
+                return func(month)
+
+            with get_connection() as conn:
+                row = conn.execute(
+                    "SELECT payload FROM month_snapshots WHERE month = ? AND kind = ?",
+                    (month, kind),
+                ).fetchone()
+                if row:
+                    return json.loads(row["payload"])
+                if _is_month_reopened(conn, month):
+                    return func(month)
+                revision = _month_data_revision(conn, month)
+
+            result = func(month)
+            with get_connection() as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO month_snapshots (month, kind, payload)
+                    SELECT ?, ?, ?
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM month_closures WHERE month = ? AND reopened = 1
+                    )
+                    AND (SELECT COALESCE(SUM(version), 0) FROM data_versions WHERE scope <= ?) = ?
+                    """,
+                    (month, kind, json.dumps(result, ensure_ascii=False), month, month, revision),
+                )
+                conn.commit()
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,93 @@
+from datetime import date, timedelta
+
+from extensions.database import get_connection
+from utils.date_utils import month_date_bounds, month_sequence, parse_date
+from utils.math_utils import from_cents
+
+
+def get_cumulative_before(dates: list[str]) -> dict[str, tuple[int, int]]:
+    unique_dates = sorted(set(dates))
+    if not unique_dates:
+        return {}
+
+    values_clause = ",".join("(?)" for _ in unique_dates)
+    with get_connection() as conn:
+        rows = conn.execute(
+            f"""
+            WITH boundaries(day) AS (VALUES {values_clause})
+            SELECT
+                boundaries.day,
+                COALESCE(
+                    (
+                        SELECT cum_income_cents FROM daily_cumulative_net
+                        WHERE date < boundaries.day ORDER BY date DESC LIMIT 1
+                    ),
+                    0
+                ) AS cum_income_cents,
+                COALESCE(
+                    (
+                        SELECT cum_expense_cents FROM daily_cumulative_net
+                        WHERE date < boundaries.day ORDER BY date DESC LIMIT 1
+                    ),
+                    0
+                ) AS cum_expense_cents
+            FROM boundaries
+            """,
+            tuple(unique_dates),
+        ).fetchall()
+
+    return {row["day"]: (int(row["cum_income_cents"]), int(row["cum_expense_cents"])) for row in rows}
+
+
+def _day_after(day: str) -> str:
+    parsed = parse_date(day)
+    return (parsed + timedelta(days=1)).isoformat() if parsed else day
+
+
+def net_flow_cents(cumulative: dict[str, tuple[int, int]], start_date: str, end_date: str) -> tuple[int, int]:
+    if end_date < start_date:
+        return 0, 0
+    start_income, start_expense = cumulative[start_date]
+    end_income, end_expense = cumulative[_day_after(end_date)]
+    return end_income - start_income, end_expense - start_expense
+
+
+def net_flow_boundaries(start_date: str, end_date: str) -> list[str]:
+    return [start_date, _day_after(end_date)]
+
+
+def get_net_flow(start_date: str, end_date: str) -> dict:
+    cumulative = get_cumulative_before(net_flow_boundaries(start_date, end_date))
+    income_cents, expense_cents = net_flow_cents(cumulative, start_date, end_date)
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "income": from_cents(income_cents),
+        "expense": from_cents(expense_cents),
+        "net": from_cents(income_cents - expense_cents),
+    }
+
+
+def get_savings_rate_series(month: str, count: int = 6) -> list[dict]:
+    months = month_sequence(month, count=count)
+    month_ranges = {m: (f"{m}-01", _day_after(month_date_bounds(m)[1])) for m in months}
+    cumulative = get_cumulative_before([day for bounds in month_ranges.values() for day in bounds])
+
+    series = []
+    for m in months:
+        start_day, next_day = month_ranges[m]
+        start_income, start_expense = cumulative[start_day]
+        end_income, end_expense = cumulative[next_day]
+        income_cents = end_income - start_income
+        expense_cents = end_expense - start_expense
+        savings_rate = ((income_cents - expense_cents) / income_cents * 100) if income_cents > 0 else 0.0
+        series.append(
+            {
+                "month": m,
+                "income": from_cents(income_cents),
+                "expense": from_cents(expense_cents),
+                "net": from_cents(income_cents - expense_cents),
+                "savings_rate": round(savings_rate, 2),
+            }
+        )
+    return series
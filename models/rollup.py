@@ -0,0 +1,141 @@
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from extensions.database import get_connection, refresh_cumulative_net
+from extensions.request_cache import request_memoized
+from utils.math_utils import from_cents, to_cents
+
+
+def apply_transactions_to_rollups(conn, transactions: list[dict]) -> None:
+    month_category_map: dict[tuple[str, str, str], list[int]] = {}
+    daily_map: dict[str, list[int]] = {}
+    for transaction in transactions:
+        amount_cents = to_cents(transaction["amount"])
+        month_key = (transaction["date"][:7], transaction["type"], transaction["category_main"])
+        month_item = month_category_map.setdefault(month_key, [0, 0])
+        month_item[0] += amount_cents
+        month_item[1] += 1
+
+        daily_item = daily_map.setdefault(transaction["date"], [0, 0, 0])
+        if transaction["type"] == "expense":
+            daily_item[0] += amount_cents
+            daily_item[2] += 1
+        else:
+            daily_item[1] += amount_cents
+
+    conn.executemany(
+        """
+        INSERT INTO monthly_category_rollup (month, type, category_main, amount_cents, tx_count)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (month, type, category_main) DO UPDATE SET
+            amount_cents = amount_cents + excluded.amount_cents,
+            tx_count = tx_count + excluded.tx_count
+        """,
+        [(*key, amount_cents, tx_count) for key, (amount_cents, tx_count) in month_category_map.items()],
+    )
+    conn.executemany(
+        """
+        INSERT INTO daily_rollup (date, expense_cents, income_cents, expense_count)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (date) DO UPDATE SET
+            expense_cents = expense_cents + excluded.expense_cents,
+            income_cents = income_cents + excluded.income_cents,
+            expense_count = expense_count + excluded.expense_count
+        """,
+        [(day, *values) for day, values in daily_map.items()],
+    )
+    if daily_map:
+        refresh_cumulative_net(conn, min(daily_map))
+
+
+def apply_transaction_to_rollups(conn, transaction: dict) -> None:
+    apply_transactions_to_rollups(conn, [transaction])
+
+
+@request_memoized
+def get_month_category_amounts(month: str, tx_type: str = "expense") -> Mapping[str, float]:
+    with get_connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT category_main, amount_cents
+            FROM monthly_category_rollup
+            WHERE month = ? AND type = ?
+            ORDER BY amount_cents DESC
+            """,
+            (month, tx_type),
+        ).fetchall()
+
+    return MappingProxyType({row["category_main"]: from_cents(row["amount_cents"]) for row in rows})
+
+
+@request_memoized
+def get_month_category_amounts_by_month(months: list[str], tx_type: str = "expense") -> Mapping[str, Mapping[str, float]]:
+    placeholders = ",".join("?" for _ in months)
+    with get_connection() as conn:
+        rows = conn.execute(
+            f"""
+            SELECT month, category_main, amount_cents
+            FROM monthly_category_rollup
+            WHERE month IN ({placeholders}) AND type = ?
+            """,
+            (*months, tx_type),
+        ).fetchall()
+
+    result: dict[str, dict[str, float]] = {m: {} for m in months}
+    for row in rows:
+        result[row["month"]][row["category_main"]] = from_cents(row["amount_cents"])
+    return MappingProxyType({m: MappingProxyType(value) for m, value in result.items()})
+
+
+@request_memoized
+def get_month_totals(months: list[str]) -> Mapping[str, Mapping[str, float]]:
+    placeholders = ",".join("?" for _ in months)
+    with get_connection() as conn:
+        rows = conn.execute(
+            f"""
+            SELECT month, type, SUM(amount_cents) AS amount_cents
+            FROM monthly_category_rollup
+            WHERE month IN ({placeholders})
+            GROUP BY month, type
+            """,
+            tuple(months),
+        ).fetchall()
+
+    result = {m: {"expense": 0.0, "income": 0.0} for m in months}
+    for row in rows:
+        result[row["month"]][row["type"]] = from_cents(row["amount_cents"])
+    return MappingProxyType({m: MappingProxyType(value) for m, value in result.items()})
+
+
+@request_memoized
+def get_daily_rollup_range(start_date: str, end_date: str) -> tuple[Mapping, ...]:
+    with get_connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT date, expense_cents, income_cents, expense_count
+            FROM daily_rollup
+            WHERE date >= ? AND date <= ?
+            ORDER BY date ASC
+            """,
+            (start_date, end_date),
+        ).fetchall()
+
+    return tuple(
+        MappingProxyType(
+            {
+                "date": row["date"],
+                "expense": from_cents(row["expense_cents"]),
+                "income": from_cents(row["income_cents"]),
+                "expense_count": int(row["expense_count"] or 0),
+            }
+        )
+        for row in rows
+    )
+
+
+def get_daily_expense_range(start_date: str, end_date: str) -> list[dict]:
+    return [
+        {"date": item["date"], "amount": item["expense"], "expense_count": item["expense_count"]}
+        for item in get_daily_rollup_range(start_date, end_date)
+        if item["expense_count"] > 0
+    ]
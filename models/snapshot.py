@@ -0,0 +1,163 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from extensions.database import get_connection
+from extensions.request_cache import request_memoized
+from utils.date_utils import month_date_bounds, month_sequence
+from utils.math_utils import from_cents
+
+
+@dataclass(frozen=True)
+class MonthSnapshot:
+    month: str
+    months: tuple[str, ...]
+    records: tuple[Mapping, ...]
+    expense_records: tuple[Mapping, ...]
+    expense_cents: int
+    income_cents: int
+    category_cents: Mapping[str, int]
+    category_counts: Mapping[str, int]
+    daily_expense_cents: Mapping[str, int]
+    window_expense_cents: Mapping[str, int]
+    window_category_cents: Mapping[str, Mapping[str, int]]
+    window_tag_cents: Mapping[str, Mapping[str, int]]
+
+    @property
+    def total_expense(self) -> float:
+        return from_cents(self.expense_cents)
+
+    @property
+    def total_income(self) -> float:
+        return from_cents(self.income_cents)
+
+    @property
+    def balance(self) -> float:
+        return from_cents(self.income_cents - self.expense_cents)
+
+    def category_amounts(self) -> dict[str, float]:
+        return {category: from_cents(cents) for category, cents in self.category_cents.items()}
+
+    def tag_amounts(self, month: str | None = None) -> dict[str, float]:
+        tag_cents = self.window_tag_cents.get(month or self.month, {})
+        return {
+            tag: from_cents(cents)
+            for tag, cents in sorted(tag_cents.items(), key=lambda item: (-item[1], item[0]))
+        }
+
+    def daily_expense(self) -> list[dict]:
+        return [
+            {"date": day, "amount": from_cents(cents)}
+            for day, cents in sorted(self.daily_expense_cents.items())
+        ]
+
+    def window_expense_amounts(self) -> dict[str, float]:
+        return {m: from_cents(cents) for m, cents in self.window_expense_cents.items()}
+
+    def window_category_amounts(self) -> dict[str, dict[str, float]]:
+        return {
+            m: {category: from_cents(cents) for category, cents in value.items()}
+            for m, value in self.window_category_cents.items()
+        }
+
+    def tagged_expense(self, tags, category_keywords=()) -> float:
+        tag_set = set(tags)
+        total_cents = 0
+        for record in self.expense_records:
+            category_name = str(record.get("category_main") or "")
+            if tag_set.intersection(record["tags"]) or any(keyword in category_name for keyword in category_keywords):
+                total_cents += record["amount_cents"]
+        return from_cents(total_cents)
+
+
+@request_memoized
+def get_month_snapshot(month: str, window: int = 3) -> MonthSnapshot:
+    months = month_sequence(month, count=window)
+    start_date = month_date_bounds(months[0])[0]
+    end_date = month_date_bounds(month)[1]
+
+    with get_connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT
+                transactions.id,
+                transactions.amount_cents,
+                transactions.type,
+                transactions.date,
+                transactions.month,
+                transactions.category_main,
+                transactions.category_sub,
+                transactions.note,
+                transactions.created_at,
+                transaction_tags.tag
+            FROM transactions
+            LEFT JOIN transaction_tags ON transaction_tags.transaction_id = transactions.id
+            WHERE transactions.date >= ? AND transactions.date <= ?
+            ORDER BY transactions.date DESC, transactions.id DESC, transaction_tags.rowid ASC
+            """,
+            (start_date, end_date),
+        ).fetchall()
+
+    window_records: list[dict] = []
+    for row in rows:
+        if window_records and window_records[-1]["id"] == row["id"]:
+            window_records[-1]["tags"].append(row["tag"])
+            continue
+        record = dict(row)
+        tag = record.pop("tag")
+        record["tags"] = [tag] if tag is not None else []
+        window_records.append(record)
+
+    records: list[Mapping] = []
+    expense_cents = 0
+    income_cents = 0
+    category_cents: dict[str, int] = {}
+    category_counts: dict[str, int] = {}
+    daily_expense_cents: dict[str, int] = {}
+    window_expense_cents = {m: 0 for m in months}
+    window_category_cents: dict[str, dict[str, int]] = {m: {} for m in months}
+    window_tag_cents: dict[str, dict[str, int]] = {m: {} for m in months}
+
+    for record in window_records:
+        record_month = record.pop("month")
+        if record_month not in window_expense_cents:
+            continue
+
+        amount_cents = record["amount_cents"]
+        if record_month == month:
+            record["tags"] = tuple(record["tags"])
+            records.append(MappingProxyType(record))
+            if record["type"] != "expense":
+                income_cents += amount_cents
+
+        if record["type"] != "expense":
+            continue
+
+        category = record["category_main"] or "其他"
+        window_expense_cents[record_month] += amount_cents
+        month_categories = window_category_cents[record_month]
+        month_categories[category] = month_categories.get(category, 0) + amount_cents
+        month_tags = window_tag_cents[record_month]
+        for tag in record["tags"]:
+            month_tags[tag] = month_tags.get(tag, 0) + amount_cents
+
+        if record_month == month:
+            expense_cents += amount_cents
+            category_cents[category] = category_cents.get(category, 0) + amount_cents
+            category_counts[category] = category_counts.get(category, 0) + 1
+            daily_expense_cents[record["date"]] = daily_expense_cents.get(record["date"], 0) + amount_cents
+
+    return MonthSnapshot(
+        month=month,
+        months=tuple(months),
+        records=tuple(records),
+        expense_records=tuple(record for record in records if record["type"] == "expense"),
+        expense_cents=expense_cents,
+        income_cents=income_cents,
+        category_cents=MappingProxyType(category_cents),
+        category_counts=MappingProxyType(category_counts),
+        daily_expense_cents=MappingProxyType(daily_expense_cents),
+        window_expense_cents=MappingProxyType(window_expense_cents),
+        window_category_cents=MappingProxyType({m: MappingProxyType(value) for m, value in window_category_cents.items()}),
+        window_tag_cents=MappingProxyType({m: MappingProxyType(value) for m, value in window_tag_cents.items()}),
+    )
@@ -1,9 +1,19 @@
-import json
+import threading
+import time
 from datetime import date, timedelta
 
+from config import SUBSCRIPTION_SYNC_RECHECK_SECONDS
 from extensions.database import get_connection
+from models.app_state import delete_app_state, get_app_state, set_app_state
+from models.data_version import SUBSCRIPTIONS_SCOPE, bump_data_versions
+from models.transaction import insert_transactions
 from utils.date_utils import next_billing_date, parse_date
-from utils.math_utils import monthly_cost
+from utils.math_utils import from_cents, monthly_cost, to_cents
+
+CHARGE_SYNC_STATE_KEY = "subscription_charges_processed_date"
+
+_charge_sync_lock = threading.Lock()
+_charge_sync_state: dict = {"processed_date": None, "earliest_due_date": None, "checked_at": 0.0}
 
 
 def _build_subscription_charge_transaction(subscription: dict, billing_date: date) -> dict:
@@ -18,71 +28,51 @@ def _build_subscription_charge_transaction(subscription: dict, billing_date: dat
     }
 
 
-def _create_subscription_charge_if_needed(conn, subscription: dict, billing_date: date) -> bool:
-    conn.execute(
+def _create_subscription_charges(conn, subscription: dict, billing_dates: list[date]) -> int:
+    subscription_id = int(subscription["id"])
+    amount_cents = to_cents(subscription["amount"])
+    conn.executemany(
         """
         INSERT OR IGNORE INTO subscription_charges (
             subscription_id,
             billing_date,
-            amount
+            amount_cents
         ) VALUES (?, ?, ?)
         """,
-        (
-            int(subscription["id"]),
-            billing_date.isoformat(),
-            round(float(subscription["amount"]), 2),
-        ),
+        [(subscription_id, billing_date.isoformat(), amount_cents) for billing_date in billing_dates],
     )
 
-    charge_row = conn.execute(
+    billing_date_set = {billing_date.isoformat() for billing_date in billing_dates}
+    charge_rows = conn.execute(
         """
-        SELECT id, transaction_id
+        SELECT id, billing_date
         FROM subscription_charges
-        WHERE subscription_id = ? AND billing_date = ?
+        WHERE subscription_id = ?
+          AND billing_date >= ?
+          AND billing_date <= ?
+          AND transaction_id IS NULL
+        ORDER BY billing_date ASC
         """,
-        (int(subscription["id"]), billing_date.isoformat()),
-    ).fetchone()
-
-    if not charge_row or charge_row["transaction_id"]:
-        return False
-
-    transaction = _build_subscription_charge_transaction(subscription, billing_date)
-    cursor = conn.execute(
-        """
-        INSERT INTO transactions (
-            amount,
-            type,
-            date,
-            category_main,
-            category_sub,
-            tags,
-            note
-        ) VALUES (?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            transaction["amount"],
-            transaction["type"],
-            transaction["date"],
-            transaction["category_main"],
-            transaction["category_sub"],
-            json.dumps(transaction["tags"], ensure_ascii=False),
-            transaction["note"],
-        ),
-    )
-
-    transaction_id = cursor.lastrowid
-    if transaction_id is None:
-        return False
-
-    conn.execute(
+        (subscription_id, billing_dates[0].isoformat(), billing_dates[-1].isoformat()),
+    ).fetchall()
+    pending_rows = [row for row in charge_rows if row["billing_date"] in billing_date_set]
+    if not pending_rows:
+        return 0
+
+    transactions = [
+        _build_subscription_charge_transaction(subscription, parse_date(row["billing_date"]))
+        for row in pending_rows
+    ]
+    transaction_ids = insert_transactions(conn, transactions)
+    conn.executemany(
         """
         UPDATE subscription_charges
         SET transaction_id = ?
         WHERE id = ?
         """,
-        (int(transaction_id), int(charge_row["id"])),
+        [(transaction_id, int(row["id"])) for transaction_id, row in zip(transaction_ids, pending_rows)],
     )
-    return True
+    return len(pending_rows)
 
 
 def process_due_subscription_charges(target_date: str | None = None) -> dict:
@@ -99,31 +89,31 @@ def process_due_subscription_charges(target_date: str | None = None) -> dict:
             SELECT
                 id,
                 name,
-                amount,
+                amount_cents,
                 cycle,
                 next_billing_date,
                 category,
                 payment_method
             FROM subscriptions
-            ORDER BY id ASC
-            """
+            WHERE next_billing_date <= ?
+            """,
+            (billing_day.isoformat(),),
         ).fetchall()
 
-        for row in rows:
+        for row in sorted(rows, key=lambda item: item["id"]):
             item = dict(row)
+            item["amount"] = from_cents(item.pop("amount_cents"))
             due_date = parse_date(item.get("next_billing_date"))
             if not due_date:
                 continue
 
-            charged_any = False
+            billing_dates = []
             while due_date <= billing_day:
-                created = _create_subscription_charge_if_needed(conn, item, due_date)
-                if created:
-                    created_transactions += 1
-                charged_any = True
+                billing_dates.append(due_date)
                 due_date = next_billing_date(due_date, item.get("cycle") or "monthly")
 
-            if charged_any:
+            if billing_dates:
+                created_transactions += _create_subscription_charges(conn, item, billing_dates)
                 conn.execute(
                     """
                     UPDATE subscriptions
@@ -134,6 +124,8 @@ def process_due_subscription_charges(target_date: str | None = None) -> dict:
                 )
                 updated_subscriptions += 1
 
+        if updated_subscriptions:
+            bump_data_versions(conn, [SUBSCRIPTIONS_SCOPE])
         conn.commit()
 
     return {
@@ -143,12 +135,60 @@ def process_due_subscription_charges(target_date: str | None = None) -> dict:
     }
 
 
+def _get_earliest_next_billing_date(conn) -> str:
+    row = conn.execute("SELECT MIN(next_billing_date) AS earliest FROM subscriptions").fetchone()
+    return row["earliest"] or date.max.isoformat()
+
+
+def _charge_sync_is_fresh(today: str) -> bool:
+    if time.monotonic() - _charge_sync_state["checked_at"] >= SUBSCRIPTION_SYNC_RECHECK_SECONDS:
+        return False
+    earliest_due_date = _charge_sync_state["earliest_due_date"]
+    return _charge_sync_state["processed_date"] == today or (
+        earliest_due_date is not None and earliest_due_date > today
+    )
+
+
+def _mark_subscriptions_changed(conn) -> None:
+    bump_data_versions(conn, [SUBSCRIPTIONS_SCOPE])
+    delete_app_state(conn, CHARGE_SYNC_STATE_KEY)
+    _charge_sync_state["processed_date"] = None
+    _charge_sync_state["earliest_due_date"] = None
+
+
+def sync_due_subscription_charges() -> dict | None:
+    today = date.today().isoformat()
+    if _charge_sync_is_fresh(today):
+        return None
+
+    with _charge_sync_lock:
+        if _charge_sync_is_fresh(today):
+            return None
+
+        with get_connection() as conn:
+            processed_date = get_app_state(conn, CHARGE_SYNC_STATE_KEY)
+            earliest_due_date = _get_earliest_next_billing_date(conn)
+
+        result = None
+        if processed_date != today and earliest_due_date <= today:
+            result = process_due_subscription_charges(today)
+            with get_connection() as conn:
+                set_app_state(conn, CHARGE_SYNC_STATE_KEY, today)
+                earliest_due_date = _get_earliest_next_billing_date(conn)
+                conn.commit()
+
+        _charge_sync_state["processed_date"] = today
+        _charge_sync_state["earliest_due_date"] = earliest_due_date
+        _charge_sync_state["checked_at"] = time.monotonic()
+        return result
+
+
 def get_subscription_actual_charge_summary(month: str) -> dict:
     with get_connection() as conn:
         row = conn.execute(
             """
             SELECT
-                COALESCE(SUM(amount), 0) AS total_amount,
+                COALESCE(SUM(amount_cents), 0) AS total_amount_cents,
                 COUNT(*) AS charge_count
             FROM subscription_charges
             WHERE substr(billing_date, 1, 7) = ?
@@ -158,7 +198,7 @@ def get_subscription_actual_charge_summary(month: str) -> dict:
 
     return {
         "month": month,
-        "actual_charged_amount": round(float(row["total_amount"] or 0), 2),
+        "actual_charged_amount": from_cents(row["total_amount_cents"]),
         "charge_count": int(row["charge_count"] or 0),
     }
 
@@ -169,7 +209,7 @@ def create_subscription(subscription: dict) -> int:
             """
             INSERT INTO subscriptions (
                 name,
-                amount,
+                amount_cents,
                 cycle,
                 next_billing_date,
                 category,
@@ -179,7 +219,7 @@ def create_subscription(subscription: dict) -> int:
             """,
             (
                 subscription["name"],
-                float(subscription["amount"]),
+                to_cents(subscription["amount"]),
                 subscription["cycle"],
                 subscription["next_billing_date"],
                 subscription.get("category") or None,
@@ -187,6 +227,7 @@ def create_subscription(subscription: dict) -> int:
                 subscription.get("note") or None,
             ),
         )
+        _mark_subscriptions_changed(conn)
         conn.commit()
         last_row_id = cursor.lastrowid
         if last_row_id is None:
@@ -201,7 +242,7 @@ def get_subscription_by_id(subscription_id: int) -> dict | None:
             SELECT
                 id,
                 name,
-                amount,
+                amount_cents,
                 cycle,
                 next_billing_date,
                 category,
@@ -218,7 +259,7 @@ def get_subscription_by_id(subscription_id: int) -> dict | None:
         return None
 
     item = dict(row)
-    item["amount"] = round(float(item["amount"]), 2)
+    item["amount"] = from_cents(item.pop("amount_cents"))
     item["monthly_cost"] = monthly_cost(item["amount"], item["cycle"])
 
     today = date.today()
@@ -242,7 +283,7 @@ def list_subscriptions() -> list[dict]:
             SELECT
                 id,
                 name,
-                amount,
+                amount_cents,
                 cycle,
                 next_billing_date,
                 category,
@@ -259,7 +300,7 @@ def list_subscriptions() -> list[dict]:
     result: list[dict] = []
     for row in rows:
         item = dict(row)
-        item["amount"] = round(float(item["amount"]), 2)
+        item["amount"] = from_cents(item.pop("amount_cents"))
         item["monthly_cost"] = monthly_cost(item["amount"], item["cycle"])
 
         next_billing = parse_date(item.get("next_billing_date"))
@@ -284,7 +325,7 @@ def update_subscription(subscription_id: int, subscription: dict) -> bool:
             UPDATE subscriptions
             SET
                 name = ?,
-                amount = ?,
+                amount_cents = ?,
                 cycle = ?,
                 next_billing_date = ?,
                 category = ?,
@@ -294,7 +335,7 @@ def update_subscription(subscription_id: int, subscription: dict) -> bool:
             """,
             (
                 subscription["name"],
-                float(subscription["amount"]),
+                to_cents(subscription["amount"]),
                 subscription["cycle"],
                 subscription["next_billing_date"],
                 subscription.get("category") or None,
@@ -303,6 +344,7 @@ def update_subscription(subscription_id: int, subscription: dict) -> bool:
                 subscription_id,
             ),
         )
+        _mark_subscriptions_changed(conn)
         conn.commit()
         return cursor.rowcount > 0
 
@@ -314,7 +356,7 @@ def delete_subscription(subscription_id: int) -> bool:
             SELECT
                 id,
                 name,
-                amount,
+                amount_cents,
                 cycle,
                 next_billing_date,
                 category,
@@ -335,7 +377,7 @@ def delete_subscription(subscription_id: int) -> bool:
             INSERT INTO subscription_cancellations (
                 subscription_id,
                 name,
-                amount,
+                amount_cents,
                 cycle,
                 next_billing_date,
                 category,
@@ -346,7 +388,7 @@ def delete_subscription(subscription_id: int) -> bool:
             (
                 int(item["id"]),
                 item["name"],
-                float(item["amount"]),
+                int(item["amount_cents"]),
                 item["cycle"],
                 item["next_billing_date"],
                 item.get("category"),
@@ -359,6 +401,7 @@ def delete_subscription(subscription_id: int) -> bool:
             "DELETE FROM subscriptions WHERE id = ?",
             (subscription_id,),
         )
+        _mark_subscriptions_changed(conn)
         conn.commit()
         return cursor.rowcount > 0
 
@@ -373,7 +416,7 @@ def get_upcoming_subscriptions(days: int = 7) -> list[dict]:
             SELECT
                 id,
                 name,
-                amount,
+                amount_cents,
                 cycle,
                 next_billing_date,
                 category,
@@ -390,7 +433,7 @@ def get_upcoming_subscriptions(days: int = 7) -> list[dict]:
     result: list[dict] = []
     for row in rows:
         item = dict(row)
-        item["amount"] = round(float(item["amount"]), 2)
+        item["amount"] = from_cents(item.pop("amount_cents"))
         item["monthly_cost"] = monthly_cost(item["amount"], item["cycle"])
         next_billing = parse_date(item.get("next_billing_date"))
         item["days_until_billing"] = (next_billing - date.today()).days if next_billing else None
@@ -469,7 +512,7 @@ def get_subscription_monthly_recap(month: str) -> dict:
             SELECT
                 id,
                 name,
-                amount,
+                amount_cents,
                 cycle,
                 next_billing_date,
                 category,
@@ -484,7 +527,7 @@ def get_subscription_monthly_recap(month: str) -> dict:
     next_month_upcoming = []
     for row in next_month_rows:
         item = dict(row)
-        item["amount"] = round(float(item["amount"]), 2)
+        item["amount"] = from_cents(item.pop("amount_cents"))
         item["monthly_cost"] = monthly_cost(item["amount"], item["cycle"])
         next_month_upcoming.append(item)
 
@@ -1,43 +1,131 @@
-import json
+from collections.abc import Mapping
 from datetime import date
+from types import MappingProxyType
 
+from config import EXPORT_FETCH_SIZE, TRANSACTION_PAGE_DEFAULT_LIMIT
 from extensions.database import get_connection
-from utils.date_utils import month_sequence
-from utils.trend_utils import parse_tags
+from extensions.request_cache import request_memoized
+from models.data_version import bump_data_versions
+from models.rollup import (
+    apply_transaction_to_rollups,
+    apply_transactions_to_rollups,
+    get_daily_expense_range,
+    get_daily_rollup_range,
+    get_month_category_amounts,
+    get_month_category_amounts_by_month,
+    get_month_totals,
+)
+from models.snapshot import get_month_snapshot
+from utils.date_utils import month_date_bounds, month_sequence
+from utils.math_utils import from_cents, to_cents
+
+
+INSERT_TRANSACTION_SQL = """
+    INSERT INTO transactions (
+        amount_cents,
+        type,
+        date,
+        category_main,
+        category_sub,
+        note
+    ) VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+
+def _transaction_row(transaction: dict) -> tuple:
+    return (
+        to_cents(transaction["amount"]),
+        transaction["type"],
+        transaction["date"],
+        transaction["category_main"],
+        transaction.get("category_sub") or None,
+        transaction.get("note") or None,
+    )
+
+
+def insert_transaction(conn, transaction: dict) -> int:
+    cursor = conn.execute(INSERT_TRANSACTION_SQL, _transaction_row(transaction))
+    last_row_id = cursor.lastrowid
+    if last_row_id is None:
+        raise RuntimeError("failed to create transaction")
+
+    tags = transaction.get("tags") or []
+    conn.executemany(
+        "INSERT OR IGNORE INTO transaction_tags (transaction_id, tag) VALUES (?, ?)",
+        [(int(last_row_id), tag) for tag in tags],
+    )
+    apply_transaction_to_rollups(conn, transaction)
+    bump_data_versions(conn, [transaction["date"][:7]])
+    return int(last_row_id)
+
+
+def insert_transactions(conn, transactions: list[dict]) -> list[int]:
+    if not transactions:
+        return []
+
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    conn.executemany(INSERT_TRANSACTION_SQL, [_transaction_row(transaction) for transaction in transactions])
+    last_id = int(conn.execute("SELECT last_insert_rowid()").fetchone()[0])
+    if last_id < len(transactions):
+        raise RuntimeError("failed to create transactions")
+
+    transaction_ids = list(range(last_id - len(transactions) + 1, last_id + 1))
+
+    conn.executemany(
+        "INSERT OR IGNORE INTO transaction_tags (transaction_id, tag) VALUES (?, ?)",
+        [
+            (transaction_id, tag)
+            for transaction_id, transaction in zip(transaction_ids, transactions)
+            for tag in transaction.get("tags") or []
+        ],
+    )
+    apply_transactions_to_rollups(conn, transactions)
+    bump_data_versions(conn, [transaction["date"][:7] for transaction in transactions])
+    return transaction_ids
+
+
+def attach_tags(conn, records: list[dict]) -> list[dict]:
+    tag_map: dict[int, list[str]] = {}
+    ids = [int(record["id"]) for record in records]
+    for offset in range(0, len(ids), 500):
+        chunk = ids[offset : offset + 500]
+        placeholders = ",".join("?" for _ in chunk)
+        rows = conn.execute(
+            f"""
+            SELECT transaction_id, tag
+            FROM transaction_tags
+            WHERE transaction_id IN ({placeholders})
+            ORDER BY rowid ASC
+            """,
+            tuple(chunk),
+        ).fetchall()
+        for row in rows:
+            tag_map.setdefault(int(row["transaction_id"]), []).append(row["tag"])
+
+    for record in records:
+        record["tags"] = tag_map.get(int(record["id"]), [])
+    return records
+
+
+def _to_public_record(record: dict) -> dict:
+    item = dict(record)
+    item["amount"] = from_cents(item.pop("amount_cents"))
+    return item
 
 
 def create_transaction(transaction: dict) -> int:
-    tags = transaction.get("tags", [])
-    tags_json = json.dumps(tags, ensure_ascii=False)
+    with get_connection() as conn:
+        transaction_id = insert_transaction(conn, transaction)
+        conn.commit()
+        return transaction_id
 
+
+def create_transactions(transactions: list[dict]) -> list[int]:
     with get_connection() as conn:
-        cursor = conn.execute(
-            """
-            INSERT INTO transactions (
-                amount,
-                type,
-                date,
-                category_main,
-                category_sub,
-                tags,
-                note
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                float(transaction["amount"]),
-                transaction["type"],
-                transaction["date"],
-                transaction["category_main"],
-                transaction.get("category_sub") or None,
-                tags_json,
-                transaction.get("note") or None,
-            ),
-        )
+        transaction_ids = insert_transactions(conn, transactions)
         conn.commit()
-        last_row_id = cursor.lastrowid
-        if last_row_id is None:
-            raise RuntimeError("failed to create transaction")
-        return int(last_row_id)
+        return transaction_ids
 
 
 def get_recent_transactions(limit: int = 10) -> list[dict]:
@@ -46,12 +134,11 @@ def get_recent_transactions(limit: int = 10) -> list[dict]:
             """
             SELECT
                 id,
-                amount,
+                amount_cents,
                 type,
                 date,
                 category_main,
                 category_sub,
-                tags,
                 note,
                 created_at
             FROM transactions
@@ -60,55 +147,21 @@ def get_recent_transactions(limit: int = 10) -> list[dict]:
             """,
             (limit,),
         ).fetchall()
+        records = attach_tags(conn, [dict(row) for row in rows])
 
-    result = []
-    for row in rows:
-        item = dict(row)
-        item["tags"] = parse_tags(item.get("tags"))
-        result.append(item)
-    return result
+    return [_to_public_record(record) for record in records]
 
 
 def get_monthly_dashboard_data(month: str | None = None) -> dict:
     if not month:
         month = date.today().strftime("%Y-%m")
 
-    with get_connection() as conn:
-        totals_row = conn.execute(
-            """
-            SELECT
-                COALESCE(SUM(CASE WHEN type = 'expense' THEN amount ELSE 0 END), 0) AS total_expense,
-                COALESCE(SUM(CASE WHEN type = 'income' THEN amount ELSE 0 END), 0) AS total_income
-            FROM transactions
-            WHERE substr(date, 1, 7) = ?
-            """,
-            (month,),
-        ).fetchone()
-
-        daily_rows = conn.execute(
-            """
-            SELECT date, ROUND(SUM(amount), 2) AS expense_amount
-            FROM transactions
-            WHERE type = 'expense' AND substr(date, 1, 7) = ?
-            GROUP BY date
-            ORDER BY date ASC
-            """,
-            (month,),
-        ).fetchall()
-
-        category_rows = conn.execute(
-            """
-            SELECT category_main, ROUND(SUM(amount), 2) AS expense_amount
-            FROM transactions
-            WHERE type = 'expense' AND substr(date, 1, 7) = ?
-            GROUP BY category_main
-            ORDER BY expense_amount DESC
-            """,
-            (month,),
-        ).fetchall()
+    daily_expense = get_daily_expense_range(*month_date_bounds(month))
+    totals = get_month_totals([month])[month]
+    category_amounts = get_month_category_amounts(month)
 
-    total_expense = float(totals_row["total_expense"] or 0)
-    total_income = float(totals_row["total_income"] or 0)
+    total_expense = totals["expense"]
+    total_income = totals["income"]
     balance = total_income - total_expense
 
     return {
@@ -118,70 +171,198 @@ def get_monthly_dashboard_data(month: str | None = None) -> dict:
             "total_income": round(total_income, 2),
             "balance": round(balance, 2),
         },
-        "daily_expense": [
-            {"date": row["date"], "amount": float(row["expense_amount"] or 0)} for row in daily_rows
-        ],
+        "daily_expense": [{"date": item["date"], "amount": item["amount"]} for item in daily_expense],
         "category_share": [
-            {"category": row["category_main"], "amount": float(row["expense_amount"] or 0)}
-            for row in category_rows
+            {"category": category, "amount": amount} for category, amount in category_amounts.items()
         ],
     }
 
 
-def get_transactions_by_month(month: str) -> list[dict]:
+@request_memoized
+def get_month_records(month: str) -> tuple[Mapping, ...]:
+    start_date, end_date = month_date_bounds(month)
     with get_connection() as conn:
         rows = conn.execute(
             """
             SELECT
                 id,
-                amount,
+                amount_cents,
                 type,
                 date,
                 category_main,
                 category_sub,
-                tags,
                 note,
                 created_at
             FROM transactions
-            WHERE substr(date, 1, 7) = ?
+            WHERE date >= ? AND date <= ?
             ORDER BY date DESC, id DESC
             """,
-            (month,),
+            (start_date, end_date),
         ).fetchall()
 
-    records: list[dict] = []
-    for row in rows:
-        item = dict(row)
-        item["amount"] = float(item["amount"])
-        item["tags"] = parse_tags(item.get("tags"))
-        records.append(item)
-    return records
+        records = attach_tags(conn, [dict(row) for row in rows])
 
+    return tuple(MappingProxyType({**record, "tags": tuple(record["tags"])}) for record in records)
 
-def get_monthly_stats(month: str) -> dict:
-    records = get_transactions_by_month(month)
 
-    total_expense = sum(record["amount"] for record in records if record["type"] == "expense")
-    total_income = sum(record["amount"] for record in records if record["type"] == "income")
-    balance = total_income - total_expense
+def get_transactions_by_month(month: str) -> list[dict]:
+    return [
+        _to_public_record({**record, "tags": list(record["tags"])}) for record in get_month_records(month)
+    ]
 
-    daily_map: dict[str, float] = {}
-    category_map: dict[str, float] = {}
-    tag_map: dict[str, float] = {}
 
-    for record in records:
-        if record["type"] != "expense":
-            continue
+def _transaction_filters(
+    start_date: str | None = None,
+    end_date: str | None = None,
+    tx_type: str | None = None,
+    category: str | None = None,
+    tag: str | None = None,
+    min_amount_cents: int | None = None,
+    max_amount_cents: int | None = None,
+) -> tuple[list[str], list]:
+    conditions: list[str] = []
+    params: list = []
+    if start_date:
+        conditions.append("date >= ?")
+        params.append(start_date)
+    if end_date:
+        conditions.append("date <= ?")
+        params.append(end_date)
+    if tx_type:
+        conditions.append("type = ?")
+        params.append(tx_type)
+    if category:
+        conditions.append("category_main = ?")
+        params.append(category)
+    if tag:
+        conditions.append(
+            "EXISTS (SELECT 1 FROM transaction_tags WHERE transaction_tags.tag = ? AND transaction_tags.transaction_id = transactions.id)"
+        )
+        params.append(tag)
+    if min_amount_cents is not None:
+        conditions.append("amount_cents >= ?")
+        params.append(min_amount_cents)
+    if max_amount_cents is not None:
+        conditions.append("amount_cents <= ?")
+        params.append(max_amount_cents)
+    return conditions, params
+
+
+def _transaction_page_query(
+    start_date: str | None = None,
+    end_date: str | None = None,
+    tx_type: str | None = None,
+    category: str | None = None,
+    tag: str | None = None,
+    min_amount: float | None = None,
+    max_amount: float | None = None,
+    after: tuple[str, int] | None = None,
+    limit: int = TRANSACTION_PAGE_DEFAULT_LIMIT,
+) -> tuple[str, tuple]:
+    conditions, params = _transaction_filters(
+        start_date,
+        end_date,
+        tx_type,
+        category,
+        tag,
+        to_cents(min_amount) if min_amount is not None else None,
+        to_cents(max_amount) if max_amount is not None else None,
+    )
+    if after is not None:
+        conditions.append("(date, id) < (?, ?)")
+        params.extend(after)
+    where_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    sql = f"""
+        SELECT
+            id,
+            amount_cents,
+            type,
+            date,
+            category_main,
+            category_sub,
+            note,
+            created_at
+        FROM transactions
+        {where_sql}
+        ORDER BY date DESC, id DESC
+        LIMIT ?
+    """
+    return sql, (*params, limit + 1)
+
+
+def list_transactions_page(
+    start_date: str | None = None,
+    end_date: str | None = None,
+    tx_type: str | None = None,
+    category: str | None = None,
+    tag: str | None = None,
+    min_amount: float | None = None,
+    max_amount: float | None = None,
+    after: tuple[str, int] | None = None,
+    limit: int = TRANSACTION_PAGE_DEFAULT_LIMIT,
+) -> dict:
+    sql, params = _transaction_page_query(
+        start_date, end_date, tx_type, category, tag, min_amount, max_amount, after, limit
+    )
 
-        amount = float(record["amount"])
-        day = record["date"]
-        category = record["category_main"] or "其他"
+    with get_connection() as conn:
+        rows = conn.execute(sql, params).fetchall()
+
+        has_more = len(rows) > limit
+        records = attach_tags(conn, [dict(row) for row in rows[:limit]])
+
+    last = records[-1] if has_more else None
+    return {
+        "items": [_to_public_record(record) for record in records],
+        "next_after": (last["date"], int(last["id"])) if last else None,
+        "has_more": has_more,
+    }
+
+
+def iter_transactions(
+    start_date: str | None = None,
+    end_date: str | None = None,
+    tx_type: str | None = None,
+    category: str | None = None,
+    tag: str | None = None,
+    batch_size: int = EXPORT_FETCH_SIZE,
+):
+    conditions, params = _transaction_filters(start_date, end_date, tx_type, category, tag)
+    where_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    with get_connection() as conn:
+        cursor = conn.execute(
+            f"""
+            SELECT
+                id,
+                amount_cents,
+                type,
+                date,
+                category_main,
+                category_sub,
+                note,
+                created_at
+            FROM transactions
+            {where_sql}
+            ORDER BY date ASC, id ASC
+            """,
+            tuple(params),
+        )
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            records = attach_tags(conn, [dict(row) for row in rows])
+            yield [_to_public_record(record) for record in records]
 
-        daily_map[day] = round(daily_map.get(day, 0) + amount, 2)
-        category_map[category] = round(category_map.get(category, 0) + amount, 2)
 
-        for tag in record["tags"]:
-            tag_map[tag] = round(tag_map.get(tag, 0) + amount, 2)
+def get_monthly_stats(month: str) -> dict:
+    snapshot = get_month_snapshot(month)
+    total_expense = snapshot.total_expense
+    total_income = snapshot.total_income
+    balance = snapshot.balance
+    category_map = snapshot.category_amounts()
+    tag_map = snapshot.tag_amounts()
 
     category_stats = []
     for category, amount in sorted(category_map.items(), key=lambda x: x[1], reverse=True):
@@ -205,9 +386,7 @@ def get_monthly_stats(month: str) -> dict:
             }
         )
 
-    daily_expense = [
-        {"date": day, "amount": amount} for day, amount in sorted(daily_map.items(), key=lambda x: x[0])
-    ]
+    daily_expense = snapshot.daily_expense()
 
     return {
         "month": month,
@@ -222,21 +401,8 @@ def get_monthly_stats(month: str) -> dict:
 
 def get_category_trend(category_name: str, month: str) -> dict:
     months = month_sequence(month, count=3)
-
-    with get_connection() as conn:
-        rows = conn.execute(
-            """
-            SELECT substr(date, 1, 7) AS month, ROUND(SUM(amount), 2) AS amount
-            FROM transactions
-            WHERE type = 'expense'
-              AND category_main = ?
-              AND substr(date, 1, 7) IN (?, ?, ?)
-            GROUP BY substr(date, 1, 7)
-            """,
-            (category_name, months[0], months[1], months[2]),
-        ).fetchall()
-
-    row_map = {row["month"]: float(row["amount"] or 0) for row in rows}
+    month_category_map = get_month_category_amounts_by_month(months)
+    row_map = {month_item: month_category_map[month_item].get(category_name, 0.0) for month_item in months}
     points = [{"month": month_item, "amount": round(row_map.get(month_item, 0), 2)} for month_item in months]
 
     return {
@@ -246,30 +412,40 @@ def get_category_trend(category_name: str, month: str) -> dict:
     }
 
 
-def get_tag_trend(tag_name: str, month: str) -> dict:
-    months = month_sequence(month, count=3)
+@request_memoized
+def get_month_tag_amounts(months: list[str], tags: list[str] | None = None) -> Mapping[str, Mapping[str, float]]:
+    month_placeholders = ",".join("?" for _ in months)
+    tag_filter = ""
+    params: list[str] = list(months)
+    if tags:
+        tag_filter = f"AND transaction_tags.tag IN ({','.join('?' for _ in tags)})"
+        params.extend(tags)
 
     with get_connection() as conn:
         rows = conn.execute(
-            """
-            SELECT
-                id,
-                amount,
-                date,
-                tags
+            f"""
+            SELECT transactions.month, transaction_tags.tag, SUM(transactions.amount_cents) AS amount_cents
             FROM transactions
-            WHERE type = 'expense'
-              AND substr(date, 1, 7) IN (?, ?, ?)
+            JOIN transaction_tags ON transaction_tags.transaction_id = transactions.id
+            WHERE transactions.type = 'expense'
+              AND transactions.month IN ({month_placeholders})
+              {tag_filter}
+            GROUP BY transactions.month, transaction_tags.tag
+            ORDER BY amount_cents DESC, transaction_tags.tag ASC
             """,
-            (months[0], months[1], months[2]),
+            tuple(params),
         ).fetchall()
 
-    month_amount: dict[str, float] = {month_item: 0.0 for month_item in months}
+    result: dict[str, dict[str, float]] = {m: {} for m in months}
     for row in rows:
-        tags = parse_tags(row["tags"])
-        if tag_name in tags:
-            month_key = row["date"][:7]
-            month_amount[month_key] = round(month_amount.get(month_key, 0) + float(row["amount"]), 2)
+        result[row["month"]][row["tag"]] = from_cents(row["amount_cents"])
+    return MappingProxyType({m: MappingProxyType(value) for m, value in result.items()})
+
+
+def get_tag_trend(tag_name: str, month: str) -> dict:
+    months = month_sequence(month, count=3)
+    month_tag_map = get_month_tag_amounts(months, [tag_name])
+    month_amount = {month_item: month_tag_map[month_item].get(tag_name, 0.0) for month_item in months}
 
     points = [{"month": month_item, "amount": round(month_amount.get(month_item, 0), 2)} for month_item in months]
 
@@ -280,54 +456,22 @@ def get_tag_trend(tag_name: str, month: str) -> dict:
     }
 
 
-def get_month_expense_by_category(month: str) -> dict[str, float]:
-    with get_connection() as conn:
-        rows = conn.execute(
-            """
-            SELECT category_main, ROUND(SUM(amount), 2) AS expense_amount
-            FROM transactions
-            WHERE type = 'expense' AND substr(date, 1, 7) = ?
-            GROUP BY category_main
-            """,
-            (month,),
-        ).fetchall()
-
-    return {row["category_main"]: float(row["expense_amount"] or 0) for row in rows}
+def get_month_expense_by_category(month: str) -> Mapping[str, float]:
+    return get_month_category_amounts(month)
 
 
 def get_today_expense(target_date: str | None = None) -> float:
     if not target_date:
         target_date = date.today().isoformat()
 
-    with get_connection() as conn:
-        row = conn.execute(
-            """
-            SELECT COALESCE(SUM(amount), 0) AS total
-            FROM transactions
-            WHERE type = 'expense' AND date = ?
-            """,
-            (target_date,),
-        ).fetchone()
-
-    return round(float(row["total"] or 0), 2)
+    days = get_daily_rollup_range(target_date, target_date)
+    return days[0]["expense"] if days else 0.0
 
 
 def get_recent_average_month_expense(month: str, count: int = 3) -> float:
     months = month_sequence(month, count=count)
-    placeholders = ",".join("?" for _ in months)
-
-    with get_connection() as conn:
-        rows = conn.execute(
-            f"""
-            SELECT substr(date, 1, 7) AS month, ROUND(SUM(amount), 2) AS amount
-            FROM transactions
-            WHERE type = 'expense' AND substr(date, 1, 7) IN ({placeholders})
-            GROUP BY substr(date, 1, 7)
-            """,
-            tuple(months),
-        ).fetchall()
-
-    month_amount_map = {row["month"]: float(row["amount"] or 0) for row in rows}
+    month_totals = get_month_totals(months)
+    month_amount_map = {month_item: month_totals[month_item]["expense"] for month_item in months}
     amounts = [month_amount_map.get(month_item, 0.0) for month_item in months]
     if not amounts:
         return 0.0
@@ -335,31 +479,15 @@ def get_recent_average_month_expense(month: str, count: int = 3) -> float:
 
 
 def get_calendar_daily_expense(month: str) -> dict:
-    with get_connection() as conn:
-        rows = conn.execute(
-            """
-            SELECT
-                date,
-                ROUND(SUM(amount), 2) AS total_expense,
-                COUNT(*) AS expense_count
-            FROM transactions
-            WHERE type = 'expense' AND substr(date, 1, 7) = ?
-            GROUP BY date
-            ORDER BY date ASC
-            """,
-            (month,),
-        ).fetchall()
-
     days = []
     max_expense = 0.0
-    for row in rows:
-        amount = round(float(row["total_expense"] or 0), 2)
-        max_expense = max(max_expense, amount)
+    for item in get_daily_expense_range(*month_date_bounds(month)):
+        max_expense = max(max_expense, item["amount"])
         days.append(
             {
-                "date": row["date"],
-                "total_expense": amount,
-                "expense_count": int(row["expense_count"] or 0),
+                "date": item["date"],
+                "total_expense": item["amount"],
+                "expense_count": item["expense_count"],
             }
         )
 
@@ -376,12 +504,11 @@ def get_calendar_day_details(target_date: str) -> dict:
             """
             SELECT
                 id,
-                amount,
+                amount_cents,
                 type,
                 date,
                 category_main,
                 category_sub,
-                tags,
                 note,
                 created_at
             FROM transactions
@@ -390,19 +517,14 @@ def get_calendar_day_details(target_date: str) -> dict:
             """,
             (target_date,),
         ).fetchall()
+        records = attach_tags(conn, [dict(row) for row in rows])
 
-    transactions = []
-    total_expense = 0.0
-    for row in rows:
-        item = dict(row)
-        item["amount"] = round(float(item["amount"] or 0), 2)
-        item["tags"] = parse_tags(item.get("tags"))
-        total_expense += item["amount"]
-        transactions.append(item)
+    total_expense_cents = sum(record["amount_cents"] for record in records)
+    transactions = [_to_public_record(record) for record in records]
 
     return {
         "date": target_date,
-        "total_expense": round(total_expense, 2),
+        "total_expense": from_cents(total_expense_cents),
         "expense_count": len(transactions),
         "transactions": transactions,
     }
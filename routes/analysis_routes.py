@@ -2,7 +2,14 @@ from datetime import date
 
 from flask import Blueprint, jsonify, render_template, request
 
-from services.analysis_service import get_analysis_dashboard_data, get_monthly_insights
+from services.analysis_service import (
+    close_month,
+    get_analysis_dashboard_data,
+    get_monthly_insights,
+    is_closable_month,
+    is_month_closed,
+    reopen_month,
+)
 
 bp = Blueprint("analysis_routes", __name__)
 
@@ -30,3 +37,22 @@ def monthly_insights_api():
 def analysis_dashboard_api():
     month = request.args.get("month") or date.today().strftime("%Y-%m")
     return jsonify(get_analysis_dashboard_data(month))
+
+
+@bp.route("/api/months/<month>/close", methods=["GET"], endpoint="month_close_status_api")
+def month_close_status_api(month: str):
+    return jsonify({"month": month, "closed": is_month_closed(month)})
+
+
+@bp.route("/api/months/<month>/close", methods=["POST"], endpoint="close_month_api")
+def close_month_api(month: str):
+    if not is_closable_month(month):
+        return jsonify({"error": "only past months can be closed"}), 400
+    return jsonify(close_month(month))
+
+
+@bp.route("/api/months/<month>/reopen", methods=["POST"], endpoint="reopen_month_api")
+def reopen_month_api(month: str):
+    if not is_closable_month(month):
+        return jsonify({"error": "only past months can be reopened"}), 400
+    return jsonify(reopen_month(month))
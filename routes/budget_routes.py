@@ -2,8 +2,9 @@ from datetime import date
 
 from flask import Blueprint, jsonify, redirect, render_template, request, url_for
 
-from config import CATEGORY_OPTIONS
+from config import CATEGORY_OPTIONS, MAX_AMOUNT
 from services.budget_service import get_budget_execution, get_budget_health_profile, upsert_budget
+from utils.math_utils import is_storable_amount
 
 bp = Blueprint("budget_routes", __name__)
 
@@ -16,7 +17,7 @@ def budget_page():
         budget_month = request.form.get("month") or month
         category_main = request.form.get("category_main") or None
         budget_amount = request.form.get("budget_amount", type=float)
-        if budget_amount and budget_amount > 0:
+        if budget_amount and budget_amount > 0 and is_storable_amount(budget_amount):
             upsert_budget(budget_month, category_main, budget_amount)
             return redirect(url_for("budget_routes.budget_page", month=budget_month, success="1"))
         return redirect(url_for("budget_routes.budget_page", month=budget_month, success="0"))
@@ -43,8 +44,15 @@ def create_budget_api():
     if not month or budget_amount in (None, ""):
         return jsonify({"error": "month and budget_amount are required"}), 400
 
+    try:
+        budget_amount = float(budget_amount)
+    except (TypeError, ValueError):
+        return jsonify({"error": "budget_amount must be a number"}), 400
+    if not is_storable_amount(budget_amount):
+        return jsonify({"error": f"budget_amount must be a finite number no greater than {MAX_AMOUNT}"}), 400
+
     category_main = payload.get("category_main") or None
-    budget_id = upsert_budget(month, category_main, float(budget_amount))
+    budget_id = upsert_budget(month, category_main, budget_amount)
     return jsonify({"id": budget_id}), 201
 
 
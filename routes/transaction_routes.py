@@ -1,29 +1,38 @@
 from datetime import date, datetime
 
-from flask import Blueprint, jsonify, render_template, request
-
-from services.analysis_service import get_monthly_insights
-from services.budget_service import get_budget_execution, get_budget_health_profile
-from services.dashboard_service import get_home_risk_cards
-from services.goal_service import get_goal_dashboard_summary
-from services.subscription_service import (
-    get_subscription_monthly_cost_summary,
-    get_subscription_monthly_metrics,
-    get_upcoming_subscriptions,
+from flask import Blueprint, Response, current_app, g, jsonify, render_template, request, stream_with_context
+
+from config import (
+    MAX_AMOUNT,
+    TRANSACTION_BATCH_MAX_ITEMS,
+    TRANSACTION_PAGE_DEFAULT_LIMIT,
+    TRANSACTION_PAGE_MAX_LIMIT,
+)
+from services.dashboard_service import (
+    DASHBOARD_WIDGETS,
+    collect_home_widgets,
+    get_dashboard_revision,
+    get_dashboard_widget,
 )
+from services.export_service import EXPORT_FORMATS, EXPORT_MIMETYPES, stream_transactions_export
+from services.import_service import detect_import_format, import_transactions
 from services.transaction_service import (
     get_calendar_daily_expense,
     get_calendar_day_details,
     create_transaction,
+    create_transaction_batch,
+    decode_transaction_cursor,
+    encode_transaction_cursor,
     get_category_trend,
-    get_monthly_dashboard_data,
     get_monthly_stats,
-    get_recent_transactions,
+    get_net_flow,
+    get_savings_rate_series,
     get_tag_trend,
-    get_today_expense,
     get_transactions_by_month,
-    normalize_transaction_payload,
+    list_transactions_page,
+    validate_transaction_item,
 )
+from utils.math_utils import is_storable_amount
 from utils.risk_utils import build_emotion_light
 
 bp = Blueprint("transaction_routes", __name__)
@@ -33,13 +42,13 @@ bp = Blueprint("transaction_routes", __name__)
 def index():
     category_palette = ["#2563EB", "#0EA5E9", "#14B8A6", "#22C55E", "#F59E0B", "#EF4444"]
     month = request.args.get("month") or date.today().strftime("%Y-%m")
-    dashboard = get_monthly_dashboard_data(month=month)
-    monthly_stats = get_monthly_stats(month)
-    budget_data = get_budget_execution(month)
-    budget_health = get_budget_health_profile(month)
+    widgets, widget_timings = collect_home_widgets(month)
+    g.dashboard_widget_timings = widget_timings
+    current_app.logger.debug("home widget timings (ms): %s", widget_timings)
 
-    current_month = date.today().strftime("%Y-%m")
-    today_expense = get_today_expense() if month == current_month else 0.0
+    dashboard = widgets["dashboard"]
+    monthly_stats = widgets["monthly_stats"]
+    budget_data = widgets["budget_data"]
     top_categories = [
         {
             **item,
@@ -48,16 +57,6 @@ def index():
         for index, item in enumerate(monthly_stats.get("category_stats", [])[:3])
     ]
     emotion_light = build_emotion_light(month, monthly_stats.get("total_expense", 0), budget_data)
-    subscription_summary = get_subscription_monthly_cost_summary()
-    subscription_metrics = get_subscription_monthly_metrics(month)
-    subscription_upcoming = get_upcoming_subscriptions(days=7)[:3]
-    recent_records = get_recent_transactions(limit=10)
-    consumption_health = get_monthly_insights(month).get("consumption_health", {})
-    goal_summary = get_goal_dashboard_summary()
-    home_risk_cards = get_home_risk_cards(
-        month=month,
-        total_expense=float(dashboard["summary"].get("total_expense", 0) or 0),
-    )
 
     return render_template(
         "index.html",
@@ -66,17 +65,11 @@ def index():
         summary=dashboard["summary"],
         daily_expense=dashboard["daily_expense"],
         category_share=dashboard["category_share"],
-        today_expense=today_expense,
+        today_expense=widgets["today_expense"],
         top_categories=top_categories,
         emotion_light=emotion_light,
-        subscription_summary=subscription_summary,
-        subscription_metrics=subscription_metrics,
-        subscription_upcoming=subscription_upcoming,
-        recent_records=recent_records,
-        consumption_health=consumption_health,
-        budget_health=budget_health,
-        goal_summary=goal_summary,
-        home_risk_cards=home_risk_cards,
+        recent_records=widgets["recent_records"],
+        dashboard_revision=get_dashboard_revision(),
     )
 
 
@@ -93,21 +86,131 @@ def calendar_page():
 @bp.route("/api/transactions", methods=["POST"], endpoint="create_transaction_api")
 def create_transaction_api():
     payload = request.get_json(silent=True) or {}
-    if payload.get("amount") in (None, "") or payload.get("date") in (None, ""):
-        return jsonify({"error": "amount and date are required"}), 400
-
-    tags = payload.get("tags", [])
-    if not isinstance(tags, list):
-        tags = []
-
-    transaction_data, error = normalize_transaction_payload(payload, tags)
+    transaction_data, error = validate_transaction_item(payload)
     if not transaction_data:
-        return jsonify({"error": error or "invalid payload"}), 400
+        return jsonify({"error": error}), 400
 
     created_id = create_transaction(transaction_data)
     return jsonify({"id": created_id}), 201
 
 
+@bp.route("/api/transactions/batch", methods=["POST"], endpoint="create_transaction_batch_api")
+def create_transaction_batch_api():
+    payload = request.get_json(silent=True)
+    atomic = request.args.get("atomic", "").lower() in ("1", "true", "yes")
+    if isinstance(payload, dict):
+        atomic = atomic or bool(payload.get("atomic"))
+        payload = payload.get("transactions")
+
+    if not isinstance(payload, list) or not payload:
+        return jsonify({"error": "transactions must be a non-empty array"}), 400
+    if len(payload) > TRANSACTION_BATCH_MAX_ITEMS:
+        return jsonify({"error": f"at most {TRANSACTION_BATCH_MAX_ITEMS} transactions per batch"}), 400
+
+    result = create_transaction_batch(payload, atomic=atomic)
+    if not result["created"]:
+        return jsonify(result), 400
+    return jsonify(result), 201
+
+
+@bp.route("/api/transactions/import", methods=["POST"], endpoint="import_transactions_api")
+def import_transactions_api():
+    upload = request.files.get("file")
+    filename = upload.filename if upload else None
+    file_format = detect_import_format(filename, request.args.get("format") or request.form.get("format"))
+    if file_format is None:
+        return jsonify({"error": "format must be csv or ndjson"}), 400
+
+    stream = upload.stream if upload else request.stream
+    report = import_transactions(stream, file_format)
+    return jsonify(report), 201 if report["imported"] else 200
+
+
+def _parse_transaction_filters() -> tuple[dict | None, str | None]:
+    start_date = (request.args.get("from") or "").strip() or None
+    end_date = (request.args.get("to") or "").strip() or None
+    try:
+        for value in (start_date, end_date):
+            if value:
+                datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        return None, "date format must be YYYY-MM-DD"
+    if start_date and end_date and start_date > end_date:
+        return None, "from must not be later than to"
+
+    tx_type = (request.args.get("type") or "").strip() or None
+    if tx_type not in (None, "expense", "income"):
+        return None, "type must be expense or income"
+
+    return (
+        {
+            "start_date": start_date,
+            "end_date": end_date,
+            "tx_type": tx_type,
+            "category": (request.args.get("category") or "").strip() or None,
+            "tag": (request.args.get("tag") or "").strip() or None,
+        },
+        None,
+    )
+
+
+@bp.route("/api/transactions/export", methods=["GET"], endpoint="export_transactions_api")
+def export_transactions_api():
+    file_format = (request.args.get("format") or "csv").strip().lower()
+    if file_format not in EXPORT_FORMATS:
+        return jsonify({"error": "format must be csv or ndjson"}), 400
+
+    filters, error = _parse_transaction_filters()
+    if error:
+        return jsonify({"error": error}), 400
+
+    filename = f"transactions_{filters['start_date'] or 'all'}_{filters['end_date'] or 'all'}.{file_format}"
+    return Response(
+        stream_with_context(stream_transactions_export(file_format, **filters)),
+        mimetype=EXPORT_MIMETYPES[file_format],
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
+@bp.route("/api/transactions/list", methods=["GET"], endpoint="list_transactions_page_api")
+def list_transactions_page_api():
+    filters, error = _parse_transaction_filters()
+    if error:
+        return jsonify({"error": error}), 400
+
+    for key in ("min_amount", "max_amount"):
+        value = request.args.get(key)
+        if value in (None, ""):
+            continue
+        try:
+            filters[key] = float(value)
+        except ValueError:
+            return jsonify({"error": f"{key} must be a number"}), 400
+        if not is_storable_amount(filters[key]):
+            return jsonify({"error": f"{key} must be a finite number no greater than {MAX_AMOUNT}"}), 400
+
+    after = None
+    cursor = (request.args.get("cursor") or "").strip()
+    if cursor:
+        after = decode_transaction_cursor(cursor)
+        if after is None:
+            return jsonify({"error": "invalid cursor"}), 400
+
+    limit = request.args.get("limit", default=str(TRANSACTION_PAGE_DEFAULT_LIMIT)).strip()
+    if not limit.isdigit() or int(limit) < 1:
+        return jsonify({"error": "limit must be a positive integer"}), 400
+    limit = min(int(limit), TRANSACTION_PAGE_MAX_LIMIT)
+
+    page = list_transactions_page(**filters, after=after, limit=limit)
+    return jsonify(
+        {
+            "items": page["items"],
+            "next_cursor": encode_transaction_cursor(page["next_after"]),
+            "has_more": page["has_more"],
+        }
+    )
+
+
 @bp.route("/api/transactions", methods=["GET"], endpoint="list_transactions_api")
 def list_transactions_api():
     month = request.args.get("month") or date.today().strftime("%Y-%m")
@@ -120,12 +223,12 @@ def monthly_stats_api():
     return jsonify(get_monthly_stats(month))
 
 
-@bp.route("/api/dashboard/risk-cards", methods=["GET"], endpoint="dashboard_risk_cards_api")
-def dashboard_risk_cards_api():
+@bp.route("/api/dashboard/<widget>", methods=["GET"], endpoint="dashboard_widget_api")
+def dashboard_widget_api(widget: str):
+    if widget not in DASHBOARD_WIDGETS:
+        return jsonify({"error": "unknown dashboard widget"}), 404
     month = request.args.get("month") or date.today().strftime("%Y-%m")
-    dashboard = get_monthly_dashboard_data(month=month)
-    total_expense = float(dashboard.get("summary", {}).get("total_expense", 0) or 0)
-    return jsonify(get_home_risk_cards(month=month, total_expense=total_expense))
+    return jsonify(get_dashboard_widget(widget, month))
 
 
 @bp.route("/api/stats/category", methods=["GET"], endpoint="category_trend_api")
@@ -146,6 +249,30 @@ def tag_trend_api():
     return jsonify(get_tag_trend(tag_name, month))
 
 
+@bp.route("/api/stats/net-flow", methods=["GET"], endpoint="net_flow_api")
+def net_flow_api():
+    start_date = (request.args.get("start") or "").strip()
+    end_date = (request.args.get("end") or "").strip()
+    if not start_date or not end_date:
+        return jsonify({"error": "start and end are required"}), 400
+
+    try:
+        datetime.strptime(start_date, "%Y-%m-%d")
+        datetime.strptime(end_date, "%Y-%m-%d")
+    except ValueError:
+        return jsonify({"error": "date format must be YYYY-MM-DD"}), 400
+
+    return jsonify(get_net_flow(start_date, end_date))
+
+
+@bp.route("/api/stats/savings-rate", methods=["GET"], endpoint="savings_rate_api")
+def savings_rate_api():
+    month = request.args.get("month") or date.today().strftime("%Y-%m")
+    count = request.args.get("count", default=6, type=int)
+    count = max(1, min(count, 36))
+    return jsonify(get_savings_rate_series(month, count))
+
+
 @bp.route("/api/calendar", methods=["GET"], endpoint="calendar_summary_api")
 def calendar_summary_api():
     month = request.args.get("month") or date.today().strftime("%Y-%m")
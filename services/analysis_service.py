@@ -1,7 +1,12 @@
 from models.analysis import get_analysis_dashboard_data, get_monthly_insights
+from models.month_close import close_month, is_closable_month, is_month_closed, reopen_month
 
 
 __all__ = [
     "get_monthly_insights",
     "get_analysis_dashboard_data",
+    "close_month",
+    "reopen_month",
+    "is_closable_month",
+    "is_month_closed",
 ]
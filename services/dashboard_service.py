@@ -1,8 +1,26 @@
+import time
 from calendar import monthrange
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 
-from services.budget_service import get_budget_health_profile
-from services.subscription_service import get_subscription_monthly_metrics
+from config import DASHBOARD_WORKERS
+from extensions.request_cache import bind_request_memo, current_request_memo
+from extensions.sql_profiler import bind_query_profile, current_query_profile
+from models.data_version import get_data_revision
+from services.analysis_service import get_monthly_insights
+from services.budget_service import get_budget_execution, get_budget_health_profile
+from services.goal_service import get_goal_dashboard_summary
+from services.subscription_service import (
+    get_subscription_monthly_cost_summary,
+    get_subscription_monthly_metrics,
+    get_upcoming_subscriptions,
+)
+from services.transaction_service import (
+    get_monthly_dashboard_data,
+    get_monthly_stats,
+    get_recent_transactions,
+    get_today_expense,
+)
 
 
 def _build_subscription_pressure(month: str, total_expense: float) -> dict:
@@ -73,4 +91,84 @@ def get_home_risk_cards(month: str, total_expense: float) -> dict:
     }
 
 
-__all__ = ["get_home_risk_cards"]
+def _get_home_risk_cards_widget(month: str) -> dict:
+    dashboard = get_monthly_dashboard_data(month=month)
+    return get_home_risk_cards(
+        month=month,
+        total_expense=float(dashboard["summary"].get("total_expense", 0) or 0),
+    )
+
+
+def _get_today_expense_widget(month: str) -> float:
+    return get_today_expense() if month == date.today().strftime("%Y-%m") else 0.0
+
+
+def _get_health_widget(month: str) -> dict:
+    return {
+        "budget_health": get_budget_health_profile(month),
+        "consumption_health": get_monthly_insights(month).get("consumption_health", {}),
+    }
+
+
+def _get_subscriptions_widget(month: str) -> dict:
+    return {
+        "summary": get_subscription_monthly_cost_summary(),
+        "metrics": get_subscription_monthly_metrics(month),
+        "upcoming": get_upcoming_subscriptions(days=7)[:3],
+    }
+
+
+HOME_WIDGETS = {
+    "dashboard": lambda month: get_monthly_dashboard_data(month=month),
+    "monthly_stats": get_monthly_stats,
+    "budget_data": get_budget_execution,
+    "today_expense": _get_today_expense_widget,
+    "recent_records": lambda month: get_recent_transactions(limit=10),
+}
+
+DASHBOARD_WIDGETS = {
+    "health": _get_health_widget,
+    "risk-cards": _get_home_risk_cards_widget,
+    "goals": lambda month: get_goal_dashboard_summary(),
+    "subscriptions": _get_subscriptions_widget,
+}
+
+
+def _run_widget(widget, month: str, memo: dict | None, profile) -> tuple[object, float]:
+    started_at = time.perf_counter()
+    with bind_request_memo(memo), bind_query_profile(profile):
+        result = widget(month)
+    return result, (time.perf_counter() - started_at) * 1000
+
+
+def collect_home_widgets(month: str) -> tuple[dict, dict[str, float]]:
+    memo = current_request_memo()
+    profile = current_query_profile()
+    results: dict = {}
+    timings: dict[str, float] = {}
+    workers = min(DASHBOARD_WORKERS, len(HOME_WIDGETS))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dashboard-widget") as executor:
+        futures = {
+            name: executor.submit(_run_widget, widget, month, memo, profile)
+            for name, widget in HOME_WIDGETS.items()
+        }
+        for name, future in futures.items():
+            results[name], timings[name] = future.result()
+    return results, timings
+
+
+def get_dashboard_widget(widget: str, month: str) -> dict:
+    return DASHBOARD_WIDGETS[widget](month)
+
+
+def get_dashboard_revision() -> str:
+    return f"{date.today().isoformat()}.{get_data_revision()}"
+
+
+__all__ = [
+    "DASHBOARD_WIDGETS",
+    "collect_home_widgets",
+    "get_dashboard_revision",
+    "get_dashboard_widget",
+    "get_home_risk_cards",
+]
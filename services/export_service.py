@@ -0,0 +1,61 @@
+import csv
+import io
+import json
+
+from models.transaction import iter_transactions
+
+EXPORT_FORMATS = ("csv", "ndjson")
+
+EXPORT_CSV_COLUMNS = ["id", "date", "type", "amount", "category_main", "category_sub", "tags", "note", "created_at"]
+
+EXPORT_MIMETYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _csv_chunks(batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")
+    writer.writerow(EXPORT_CSV_COLUMNS)
+    for records in batches:
+        for record in records:
+            writer.writerow(
+                [
+                    record["id"],
+                    record["date"],
+                    record["type"],
+                    f"{record['amount']:.2f}",
+                    record["category_main"],
+                    record["category_sub"] or "",
+                    "|".join(record["tags"]),
+                    record["note"] or "",
+                    record["created_at"] or "",
+                ]
+            )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _ndjson_chunks(batches):
+    for records in batches:
+        yield "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+
+
+def stream_transactions_export(file_format: str, **filters):
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"unsupported export format: {file_format}")
+
+    batches = iter_transactions(**filters)
+    return _csv_chunks(batches) if file_format == "csv" else _ndjson_chunks(batches)
+
+
+__all__ = [
+    "EXPORT_FORMATS",
+    "EXPORT_MIMETYPES",
+    "stream_transactions_export",
+]
@@ -1,6 +1,8 @@
 from datetime import date, datetime
 
+from config import MAX_AMOUNT
 from models.goal import create_goal, get_goal_progress_list
+from utils.math_utils import is_storable_amount
 
 
 def validate_goal_payload(payload: dict) -> tuple[dict | None, str | None]:
@@ -16,6 +18,8 @@ def validate_goal_payload(payload: dict) -> tuple[dict | None, str | None]:
 
     if target_amount <= 0:
         return None, "target_amount must be greater than 0"
+    if not is_storable_amount(target_amount):
+        return None, f"target_amount must be a finite number no greater than {MAX_AMOUNT}"
 
     deadline = str(payload.get("deadline") or "").strip()
     if not deadline:
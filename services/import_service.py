@@ -0,0 +1,126 @@
+import csv
+import io
+import json
+import re
+
+from config import IMPORT_CHUNK_SIZE, IMPORT_MAX_ERRORS
+from services.transaction_service import TRANSACTION_WRITE_ERRORS, create_transactions, validate_transaction_item
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+_TAG_SEPARATORS = re.compile(r"[|、,;，；]")
+
+
+def detect_import_format(filename: str | None, requested: str | None = None) -> str | None:
+    if requested:
+        requested = requested.strip().lower()
+        if requested in ("json", "jsonl"):
+            return "ndjson"
+        return requested if requested in IMPORT_FORMATS else None
+
+    suffix = (filename or "").rsplit(".", 1)[-1].lower()
+    if suffix == "csv":
+        return "csv"
+    if suffix in ("ndjson", "jsonl"):
+        return "ndjson"
+    return None
+
+
+def _text_stream(binary_stream) -> io.TextIOWrapper:
+    if not hasattr(binary_stream, "read1"):
+        binary_stream = io.BufferedReader(binary_stream)
+    return io.TextIOWrapper(binary_stream, encoding="utf-8-sig", newline="")
+
+
+def _iter_csv_rows(text_stream):
+    reader = csv.DictReader(text_stream)
+    for row in reader:
+        payload = {str(key).strip(): (value or "").strip() for key, value in row.items() if key is not None}
+        tags = payload.get("tags", "")
+        payload["tags"] = [tag.strip() for tag in _TAG_SEPARATORS.split(tags) if tag.strip()]
+        yield reader.line_num, payload, None
+
+
+def _iter_ndjson_rows(text_stream):
+    for line_number, line in enumerate(text_stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line), None
+        except json.JSONDecodeError:
+            yield line_number, None, "invalid json"
+
+
+def _write_chunk(chunk: list[tuple[int, dict]]) -> tuple[int, list[dict]]:
+    try:
+        return len(create_transactions([transaction_data for _, transaction_data in chunk])), []
+    except TRANSACTION_WRITE_ERRORS:
+        pass
+
+    imported = 0
+    errors: list[dict] = []
+    for line_number, transaction_data in chunk:
+        try:
+            imported += len(create_transactions([transaction_data]))
+        except TRANSACTION_WRITE_ERRORS as exc:
+            errors.append({"line": line_number, "error": f"failed to save: {exc}"})
+    return imported, errors
+
+
+def import_transactions(binary_stream, file_format: str, chunk_size: int = IMPORT_CHUNK_SIZE) -> dict:
+    if file_format not in IMPORT_FORMATS:
+        raise ValueError(f"unsupported import format: {file_format}")
+
+    text_stream = _text_stream(binary_stream)
+    rows = _iter_csv_rows(text_stream) if file_format == "csv" else _iter_ndjson_rows(text_stream)
+
+    imported = 0
+    failed = 0
+    errors: list[dict] = []
+    chunk: list[tuple[int, dict]] = []
+
+    def flush() -> None:
+        nonlocal imported, failed
+        written, write_errors = _write_chunk(chunk)
+        imported += written
+        failed += len(write_errors)
+        errors.extend(write_errors[: max(0, IMPORT_MAX_ERRORS - len(errors))])
+        chunk.clear()
+
+    try:
+        for line_number, payload, error in rows:
+            transaction_data = None
+            if error is None:
+                transaction_data, error = validate_transaction_item(payload)
+
+            if transaction_data is None:
+                failed += 1
+                if len(errors) < IMPORT_MAX_ERRORS:
+                    errors.append({"line": line_number, "error": error})
+                continue
+
+            chunk.append((line_number, transaction_data))
+            if len(chunk) >= chunk_size:
+                flush()
+    except (UnicodeDecodeError, csv.Error) as exc:
+        failed += 1
+        if len(errors) < IMPORT_MAX_ERRORS:
+            errors.append({"line": None, "error": f"unreadable file: {exc}"})
+
+    if chunk:
+        flush()
+
+    return {
+        "format": file_format,
+        "imported": imported,
+        "failed": failed,
+        "errors": errors,
+        "errors_truncated": failed > len(errors),
+    }
+
+
+__all__ = [
+    "IMPORT_FORMATS",
+    "detect_import_format",
+    "import_transactions",
+]
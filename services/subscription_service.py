@@ -10,8 +10,10 @@ from models.subscription import (
     get_upcoming_subscriptions,
     list_subscriptions,
     process_due_subscription_charges,
+    sync_due_subscription_charges,
     update_subscription,
 )
+from utils.math_utils import is_storable_amount
 
 
 def build_subscription_payload(data: dict) -> dict | None:
@@ -29,7 +31,7 @@ def build_subscription_payload(data: dict) -> dict | None:
         amount = float(amount_value) if amount_value is not None else 0.0
     except (TypeError, ValueError):
         return None
-    if amount <= 0:
+    if amount <= 0 or not is_storable_amount(amount):
         return None
 
     next_billing_date = str(data.get("next_billing_date"))
@@ -63,5 +65,6 @@ __all__ = [
     "get_upcoming_subscriptions",
     "list_subscriptions",
     "process_due_subscription_charges",
+    "sync_due_subscription_charges",
     "update_subscription",
 ]
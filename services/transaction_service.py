@@ -1,9 +1,13 @@
+import sqlite3
 from datetime import date, datetime
 
+from config import MAX_AMOUNT
+from models.net_flow import get_net_flow, get_savings_rate_series
 from models.transaction import (
     get_calendar_daily_expense,
     get_calendar_day_details,
     create_transaction,
+    create_transactions,
     get_category_trend,
     get_monthly_dashboard_data,
     get_monthly_stats,
@@ -12,7 +16,11 @@ from models.transaction import (
     get_tag_trend,
     get_today_expense,
     get_transactions_by_month,
+    list_transactions_page,
 )
+from utils.math_utils import is_storable_amount
+
+TRANSACTION_WRITE_ERRORS = (sqlite3.Error, ValueError, OverflowError, RuntimeError)
 
 
 def normalize_transaction_payload(data: dict, tags: list[str] | None = None) -> tuple[dict | None, str | None]:
@@ -24,6 +32,8 @@ def normalize_transaction_payload(data: dict, tags: list[str] | None = None) ->
 
     if amount <= 0:
         return None, "amount must be greater than 0"
+    if not is_storable_amount(amount):
+        return None, f"amount must be a finite number no greater than {MAX_AMOUNT}"
 
     tx_type = str(data.get("type", "expense")).strip()
     if tx_type not in ("expense", "income"):
@@ -35,11 +45,11 @@ def normalize_transaction_payload(data: dict, tags: list[str] | None = None) ->
     except ValueError:
         return None, "invalid date"
 
-    note = str(data.get("note", "")).strip()
+    note = str(data.get("note") or "").strip()
 
     if tx_type == "income":
-        income_source = str(data.get("income_source", "")).strip() or str(
-            data.get("category_sub", "")
+        income_source = str(data.get("income_source") or "").strip() or str(
+            data.get("category_sub") or ""
         ).strip()
         if not income_source:
             return None, "income_source is required for income"
@@ -56,11 +66,11 @@ def normalize_transaction_payload(data: dict, tags: list[str] | None = None) ->
             None,
         )
 
-    category_main = str(data.get("category_main", "")).strip()
+    category_main = str(data.get("category_main") or "").strip()
     if not category_main:
         return None, "category_main is required for expense"
 
-    category_sub = str(data.get("category_sub", "")).strip()
+    category_sub = str(data.get("category_sub") or "").strip()
     normalized_tags = [str(tag).strip() for tag in (tags or []) if str(tag).strip()]
 
     return (
@@ -77,9 +87,88 @@ def normalize_transaction_payload(data: dict, tags: list[str] | None = None) ->
     )
 
 
+def validate_transaction_item(payload: dict) -> tuple[dict | None, str | None]:
+    if not isinstance(payload, dict):
+        return None, "transaction must be an object"
+    if payload.get("amount") in (None, "") or payload.get("date") in (None, ""):
+        return None, "amount and date are required"
+
+    tags = payload.get("tags", [])
+    if not isinstance(tags, list):
+        tags = []
+
+    transaction_data, error = normalize_transaction_payload(payload, tags)
+    if not transaction_data:
+        return None, error or "invalid payload"
+    return transaction_data, None
+
+
+def encode_transaction_cursor(after: tuple[str, int] | None) -> str | None:
+    if after is None:
+        return None
+    return f"{after[0]}_{after[1]}"
+
+
+def decode_transaction_cursor(cursor: str) -> tuple[str, int] | None:
+    cursor_date, _, cursor_id = cursor.partition("_")
+    try:
+        datetime.strptime(cursor_date, "%Y-%m-%d")
+        return cursor_date, int(cursor_id)
+    except ValueError:
+        return None
+
+
+def _save_individually(valid: list[tuple[int, dict]], results: list[dict]) -> int:
+    created = 0
+    for index, transaction_data in valid:
+        try:
+            results[index]["id"] = create_transactions([transaction_data])[0]
+            created += 1
+        except TRANSACTION_WRITE_ERRORS as exc:
+            results[index]["error"] = f"failed to save: {exc}"
+    return created
+
+
+def create_transaction_batch(items: list, atomic: bool = False) -> dict:
+    results: list[dict] = []
+    valid: list[tuple[int, dict]] = []
+    for index, item in enumerate(items):
+        transaction_data, error = validate_transaction_item(item)
+        if transaction_data is None:
+            results.append({"index": index, "error": error})
+        else:
+            valid.append((index, transaction_data))
+            results.append({"index": index})
+
+    failed = len(items) - len(valid)
+    if atomic and failed:
+        return {"created": 0, "failed": failed, "results": results}
+
+    try:
+        transaction_ids = create_transactions([transaction_data for _, transaction_data in valid])
+    except TRANSACTION_WRITE_ERRORS as exc:
+        if atomic:
+            for index, _ in valid:
+                results[index]["error"] = f"failed to save: {exc}"
+            return {"created": 0, "failed": len(items), "results": results}
+        created = _save_individually(valid, results)
+        return {"created": created, "failed": len(items) - created, "results": results}
+
+    for (index, _), transaction_id in zip(valid, transaction_ids):
+        results[index]["id"] = transaction_id
+    return {"created": len(transaction_ids), "failed": failed, "results": results}
+
+
 __all__ = [
+    "TRANSACTION_WRITE_ERRORS",
     "normalize_transaction_payload",
+    "validate_transaction_item",
+    "create_transaction_batch",
+    "encode_transaction_cursor",
+    "decode_transaction_cursor",
+    "list_transactions_page",
     "create_transaction",
+    "create_transactions",
     "get_recent_transactions",
     "get_monthly_dashboard_data",
     "get_monthly_stats",
@@ -90,4 +179,6 @@ __all__ = [
     "get_recent_average_month_expense",
     "get_calendar_daily_expense",
     "get_calendar_day_details",
+    "get_net_flow",
+    "get_savings_rate_series",
 ]
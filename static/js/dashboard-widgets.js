@@ -0,0 +1,310 @@
+(function () {
+  const CACHE_PREFIX = "mm.dashboard.";
+  const memoryCache = new Map();
+  const chartTheme = window.MMChartTheme;
+  let state = { month: "", revision: "" };
+  let subscriptionPressureChartInstance = null;
+  let budgetRiskChartInstance = null;
+
+  const escapeHtml = function (value) {
+    return String(value === null || value === undefined ? "" : value)
+      .replace(/&/g, "&amp;")
+      .replace(/</g, "&lt;")
+      .replace(/>/g, "&gt;")
+      .replace(/"/g, "&quot;")
+      .replace(/'/g, "&#39;");
+  };
+
+  const formatNumber = function (value) {
+    return Number(value || 0).toFixed(2);
+  };
+
+  const setText = function (id, text) {
+    const element = document.getElementById(id);
+    if (element) {
+      element.textContent = text;
+    }
+  };
+
+  const setHtml = function (id, html) {
+    const element = document.getElementById(id);
+    if (element) {
+      element.innerHTML = html;
+    }
+  };
+
+  const cacheKey = function (widget, month) {
+    return `${CACHE_PREFIX}${state.revision}.${widget}.${month}`;
+  };
+
+  const readStoredWidget = function (key) {
+    try {
+      const raw = window.sessionStorage.getItem(key);
+      return raw ? JSON.parse(raw) : null;
+    } catch (_error) {
+      return null;
+    }
+  };
+
+  const storeWidget = function (key, payload) {
+    try {
+      for (let index = window.sessionStorage.length - 1; index >= 0; index -= 1) {
+        const storedKey = window.sessionStorage.key(index);
+        if (storedKey && storedKey.startsWith(CACHE_PREFIX) && !storedKey.startsWith(`${CACHE_PREFIX}${state.revision}.`)) {
+          window.sessionStorage.removeItem(storedKey);
+        }
+      }
+      window.sessionStorage.setItem(key, JSON.stringify(payload));
+    } catch (_error) {
+      return;
+    }
+  };
+
+  const fetchWidget = function (widget, month) {
+    const key = cacheKey(widget, month);
+    if (memoryCache.has(key)) {
+      return memoryCache.get(key);
+    }
+
+    const stored = state.revision ? readStoredWidget(key) : null;
+    const request = stored
+      ? Promise.resolve(stored)
+      : fetch(`/api/dashboard/${widget}?month=${encodeURIComponent(month)}`).then(function (response) {
+          if (!response.ok) {
+            throw new Error(`failed to load dashboard widget: ${widget}`);
+          }
+          return response.json().then(function (payload) {
+            if (state.revision) {
+              storeWidget(key, payload);
+            }
+            return payload;
+          });
+        });
+
+    memoryCache.set(key, request);
+    request.catch(function () {
+      memoryCache.delete(key);
+    });
+    return request;
+  };
+
+  const renderHealth = function (payload) {
+    const budgetHealth = payload.budget_health || {};
+    const score = budgetHealth.score || {};
+    const consumptionHealth = payload.consumption_health || {};
+    const metrics = consumptionHealth.metrics || {};
+    const riskHints = Array.isArray(budgetHealth.risk_hints) ? budgetHealth.risk_hints : [];
+
+    setText("budget-health-score", formatNumber(score.value));
+    setText("budget-health-level", `${score.level || ""} · 执行率 ${formatNumber(score.execution_rate)}%`);
+    setText("consumption-health-score", formatNumber(consumptionHealth.score));
+    setText(
+      "consumption-health-level",
+      `${consumptionHealth.level || "一般"} · 冲动占比 ${formatNumber(metrics.impulsive_ratio)}%`
+    );
+
+    if (riskHints.length === 0) {
+      setHtml("home-budget-hints", '<div class="helper-text">当前月未识别到明显预算风险类别。</div>');
+      return;
+    }
+
+    setHtml(
+      "home-budget-hints",
+      `<div class="category-list" style="margin-top: 10px;">
+        ${riskHints
+          .map(
+            (hint) => `<div class="category-item">
+              <div class="category-main">
+                <div class="category-name">${escapeHtml(hint)}</div>
+              </div>
+            </div>`
+          )
+          .join("")}
+      </div>
+      <div class="section-insight">洞察：优先处理“刚需类超支”与“高频冲动消费”组合项，改善会最明显。</div>`
+    );
+  };
+
+  const renderRiskCardCharts = function (riskCards) {
+    const subscription = (riskCards && riskCards.subscription_pressure) || {};
+    const budget = (riskCards && riskCards.budget_risk) || {};
+
+    const ratio = Number(subscription.ratio || 0);
+    const ratioClamped = Math.max(0, Math.min(100, ratio));
+    const executionRate = Number(budget.execution_rate || 0);
+    const executionClamped = Math.max(0, Math.min(100, executionRate));
+
+    const subscriptionCanvas = document.getElementById("subscriptionPressureChart");
+    if (subscriptionCanvas) {
+      if (subscriptionPressureChartInstance) {
+        subscriptionPressureChartInstance.destroy();
+      }
+      subscriptionPressureChartInstance = new Chart(subscriptionCanvas, {
+        type: "doughnut",
+        data: {
+          labels: ["订阅占比", "其他支出"],
+          datasets: [
+            {
+              data: [ratioClamped, Math.max(0, 100 - ratioClamped)],
+              borderWidth: 0,
+              backgroundColor: ["#0EA5E9", chartTheme.alpha("#64748B", 0.24)],
+            },
+          ],
+        },
+        options: {
+          ...chartTheme.pieOptions(),
+          cutout: "68%",
+        },
+      });
+    }
+
+    const budgetCanvas = document.getElementById("budgetRiskChart");
+    if (budgetCanvas) {
+      if (budgetRiskChartInstance) {
+        budgetRiskChartInstance.destroy();
+      }
+      const budgetColor = executionRate >= 100 ? "#EF4444" : executionRate >= 85 ? "#F59E0B" : "#22C55E";
+      budgetRiskChartInstance = new Chart(budgetCanvas, {
+        type: "doughnut",
+        data: {
+          labels: ["预算执行", "预算余量"],
+          datasets: [
+            {
+              data: [executionClamped, Math.max(0, 100 - executionClamped)],
+              borderWidth: 0,
+              backgroundColor: [budgetColor, chartTheme.alpha("#64748B", 0.24)],
+            },
+          ],
+        },
+        options: {
+          ...chartTheme.pieOptions(),
+          cutout: "68%",
+        },
+      });
+    }
+  };
+
+  const renderRiskCards = function (riskCards) {
+    const subscription = (riskCards && riskCards.subscription_pressure) || {};
+    const budget = (riskCards && riskCards.budget_risk) || {};
+    const categories = Array.isArray(budget.risk_categories) ? budget.risk_categories : [];
+
+    setText("subscription-pressure-cost", `¥${formatNumber(subscription.monthly_cost)}`);
+    setText("subscription-pressure-ratio", `占本月总支出 ${formatNumber(subscription.ratio)}%`);
+    setText("subscription-pressure-level", `风险等级：${subscription.risk_level || "低"}`);
+    setText("budget-risk-rate", `执行率 ${formatNumber(budget.execution_rate)}%`);
+    setText("budget-risk-categories", `风险类别：${categories.length ? categories.join(" / ") : "暂无"}`);
+    setText(
+      "budget-risk-forecast",
+      `预测：${budget.will_overspend ? "预计会超支" : "预计可控"}（期末 ${formatNumber(budget.projected_execution_rate)}%）`
+    );
+    renderRiskCardCharts(riskCards);
+  };
+
+  const renderGoals = function (goalSummary) {
+    const nextGoal = goalSummary && goalSummary.next_goal;
+    if (!nextGoal) {
+      setHtml(
+        "home-goal-panel",
+        `<div class="helper-text">暂无目标，点击下方按钮创建第一个目标。</div>
+        <div style="margin-top: 10px;"><a class="btn-secondary" href="/goals">创建目标</a></div>`
+      );
+      return;
+    }
+
+    setHtml(
+      "home-goal-panel",
+      `<div class="kpi-label" style="margin-top: 8px;">
+        目标总数：${Number(goalSummary.total_count || 0)} ｜ 进行中：${Number(goalSummary.active_count || 0)} ｜ 落后：${Number(goalSummary.behind_count || 0)}
+      </div>
+      <div class="category-list" style="margin-top: 10px;">
+        <div class="category-item">
+          <div class="category-main">
+            <div class="category-name">${escapeHtml(nextGoal.name)}</div>
+            <div class="small">截止 ${escapeHtml(nextGoal.deadline)} · 预期 ${formatNumber(nextGoal.expected_progress_rate)}%</div>
+          </div>
+          <div class="mono" style="text-align: right;">
+            <div>${formatNumber(nextGoal.progress_rate)}%</div>
+            <div class="small">每月需存 ¥${formatNumber(nextGoal.monthly_required)}</div>
+          </div>
+        </div>
+      </div>
+      <div style="margin-top: 10px;"><a class="btn-secondary" href="/goals">进入目标管理</a></div>`
+    );
+  };
+
+  const renderSubscriptions = function (payload) {
+    const metrics = payload.metrics || {};
+    const summary = payload.summary || {};
+    const upcoming = Array.isArray(payload.upcoming) ? payload.upcoming : [];
+
+    const header = `<div class="kpi-label" style="margin-top: 8px;">
+      本月预计订阅成本：<span class="mono">¥${formatNumber(metrics.estimated_monthly_cost)}</span>
+      ｜ 本月实际订阅扣费：<span class="mono">¥${formatNumber(metrics.actual_charged_amount)}</span>
+      ｜ 未来 7 天：${Number(summary.upcoming_count || 0)} 项
+    </div>`;
+
+    if (upcoming.length === 0) {
+      setHtml("home-subscription-panel", `${header}<div class="helper-text">未来 7 天暂无订阅扣费。</div>`);
+      return;
+    }
+
+    setHtml(
+      "home-subscription-panel",
+      `${header}
+      <div class="category-list" style="margin-top: 10px;">
+        ${upcoming
+          .map(
+            (item) => `<div class="category-item">
+              <div class="category-main">
+                <div class="category-name">
+                  <span>${escapeHtml(item.name)}</span>
+                </div>
+                <div class="small">${escapeHtml(item.next_billing_date)} · ${escapeHtml(item.cycle)}</div>
+              </div>
+              <div class="mono" style="text-align: right;">
+                <div>¥${formatNumber(item.amount)}</div>
+                <div class="small">月折算 ¥${formatNumber(item.monthly_cost)}</div>
+              </div>
+            </div>`
+          )
+          .join("")}
+      </div>`
+    );
+  };
+
+  const renderers = {
+    health: renderHealth,
+    "risk-cards": renderRiskCards,
+    goals: renderGoals,
+    subscriptions: renderSubscriptions,
+  };
+
+  const loadWidget = function (widget) {
+    const month = state.month;
+    return fetchWidget(widget, month)
+      .then(function (payload) {
+        if (month === state.month) {
+          renderers[widget](payload || {});
+        }
+      })
+      .catch(function () {
+        return;
+      });
+  };
+
+  const loadAll = function (month, revision) {
+    if (!month) {
+      return Promise.resolve();
+    }
+    state = { month: month, revision: revision || "" };
+    return Promise.all(Object.keys(renderers).map(loadWidget));
+  };
+
+  const refresh = function () {
+    memoryCache.clear();
+    return loadAll(state.month, "");
+  };
+
+  window.MMDashboardWidgets = { loadAll: loadAll, refresh: refresh };
+})();
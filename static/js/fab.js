@@ -111,6 +111,10 @@
       return;
     }
 
+    if (window.MMDashboardWidgets) {
+      window.MMDashboardWidgets.refresh();
+    }
+
     const rows = await response.json();
     const sorted = Array.isArray(rows)
       ? rows.slice().sort((a, b) => {
@@ -0,0 +1,78 @@
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+os.environ["MONEY_MANAGER_DB_PATH"] = str(Path(tempfile.mkdtemp(prefix="moneymanager-tests-")) / "money_manager.db")
+
+import pytest
+
+from app import app as flask_app
+from extensions import database
+from extensions.database import get_connection
+from models.data_version import clear_analytics_cache
+
+
+@pytest.fixture()
+def db_path(tmp_path, monkeypatch):
+    path = tmp_path / "money_manager.db"
+    monkeypatch.setattr(database, "DB_PATH", path)
+    monkeypatch.setattr(database, "DB_DIR", tmp_path)
+    database.close_pooled_connections()
+    clear_analytics_cache()
+    yield path
+    database.close_pooled_connections()
+    clear_analytics_cache()
+
+
+@pytest.fixture()
+def app(db_path):
+    database.init_db()
+    return flask_app
+
+
+@pytest.fixture()
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture()
+def failing_writes(monkeypatch):
+    def patch(module, note: str = "boom") -> None:
+        real_create_transactions = module.create_transactions
+
+        def create_transactions(transactions):
+            if any(transaction["note"] == note for transaction in transactions):
+                raise sqlite3.IntegrityError("simulated write failure")
+            return real_create_transactions(transactions)
+
+        monkeypatch.setattr(module, "create_transactions", create_transactions)
+
+    return patch
+
+
+def make_transaction(**overrides) -> dict:
+    transaction = {
+        "amount": 12.5,
+        "type": "expense",
+        "date": "2025-03-01",
+        "category_main": "餐饮",
+        "category_sub": "午餐",
+        "tags": [],
+        "note": "",
+    }
+    transaction.update(overrides)
+    return transaction
+
+
+def count_transactions() -> int:
+    with get_connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+
+
+def stored_amounts() -> list[int]:
+    with get_connection() as conn:
+        return [row[0] for row in conn.execute("SELECT amount_cents FROM transactions ORDER BY id").fetchall()]
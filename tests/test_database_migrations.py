@@ -0,0 +1,201 @@
+import sqlite3
+
+from extensions import database
+from extensions.database import SCHEMA_VERSION, get_connection, get_schema_version, init_db
+from models.transaction import get_monthly_stats
+
+LEGACY_SCHEMA = """
+    CREATE TABLE transactions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        amount REAL NOT NULL,
+        type TEXT CHECK(type IN ('income', 'expense')) NOT NULL,
+        date TEXT NOT NULL,
+        category_main TEXT NOT NULL,
+        category_sub TEXT,
+        tags TEXT,
+        payment_method TEXT,
+        note TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE budgets (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        month TEXT NOT NULL,
+        category_main TEXT,
+        budget_amount REAL NOT NULL
+    );
+    CREATE TABLE ai_archives (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        month TEXT NOT NULL,
+        content TEXT NOT NULL,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE subscriptions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        amount REAL NOT NULL,
+        cycle TEXT CHECK(cycle IN ('monthly', 'yearly', 'weekly', 'quarterly')) NOT NULL,
+        next_billing_date TEXT NOT NULL,
+        category TEXT,
+        payment_method TEXT,
+        note TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE subscription_cancellations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        subscription_id INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        amount REAL NOT NULL,
+        cycle TEXT NOT NULL,
+        next_billing_date TEXT NOT NULL,
+        category TEXT,
+        payment_method TEXT,
+        note TEXT,
+        cancelled_at TEXT DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE subscription_charges (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        subscription_id INTEGER NOT NULL,
+        billing_date TEXT NOT NULL,
+        amount REAL NOT NULL,
+        transaction_id INTEGER,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(subscription_id, billing_date)
+    );
+    CREATE TABLE goals (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        target_amount REAL NOT NULL,
+        deadline TEXT NOT NULL,
+        note TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    );
+"""
+
+LEGACY_TRANSACTIONS = [
+    (1, 12.34, "expense", "2025-03-01", "餐饮", "午餐", '["冲动", " 社交 ", ""]', "微信", "n1"),
+    (2, 0.1 + 0.2, "expense", "2025-03-01", "交通", None, "[]", None, None),
+    (3, 19.99, "expense", "2025-03-15", "餐饮", None, "not json", "支付宝", None),
+    (4, 3000, "income", "2025-03-05", "收入", "生活费", '{"tag": "冲动"}', None, None),
+    (5, 7.5, "expense", "2025-04-02", "娱乐", None, '["冲动", "冲动"]', None, "n5"),
+    (6, 42, "expense", "2025-04-03", "娱乐", None, None, None, None),
+]
+
+
+def _build_legacy_database(path) -> None:
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript(LEGACY_SCHEMA)
+        conn.executemany(
+            """
+            INSERT INTO transactions (
+                id, amount, type, date, category_main, category_sub, tags, payment_method, note
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            LEGACY_TRANSACTIONS,
+        )
+        conn.execute("DELETE FROM transactions WHERE id = 6")
+        conn.executemany(
+            "INSERT INTO budgets (month, category_main, budget_amount) VALUES (?, ?, ?)",
+            [("2025-03", None, 1500.5), ("2025-03", "餐饮", 600)],
+        )
+        conn.execute("INSERT INTO ai_archives (month, content) VALUES ('2025-03', '三月复盘')")
+        conn.execute(
+            """
+            INSERT INTO subscriptions (name, amount, cycle, next_billing_date, category, payment_method)
+            VALUES ('音乐会员', 25.9, 'monthly', '2099-01-01', '娱乐', '微信')
+            """
+        )
+        conn.execute(
+            """
+            INSERT INTO subscription_cancellations (subscription_id, name, amount, cycle, next_billing_date)
+            VALUES (9, '网盘', 9.9, 'monthly', '2025-02-01')
+            """
+        )
+        conn.execute(
+            """
+            INSERT INTO subscription_charges (subscription_id, billing_date, amount, transaction_id)
+            VALUES (1, '2025-03-01', 25.9, 2)
+            """
+        )
+        conn.execute("INSERT INTO goals (name, target_amount, deadline) VALUES ('旅行', 10000.01, '2099-12-31')")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _rows(conn, sql: str) -> list[tuple]:
+    return [tuple(row) for row in conn.execute(sql).fetchall()]
+
+
+def test_legacy_database_migrates_without_data_loss(db_path):
+    _build_legacy_database(db_path)
+
+    init_db()
+
+    with get_connection() as conn:
+        assert get_schema_version(conn) == SCHEMA_VERSION
+        assert not {"amount", "tags", "payment_method"} & set(database._table_columns(conn, "transactions"))
+        assert _rows(conn, "SELECT id, amount_cents, month, category_sub, note FROM transactions ORDER BY id") == [
+            (1, 1234, "2025-03", "午餐", "n1"),
+            (2, 30, "2025-03", None, None),
+            (3, 1999, "2025-03", None, None),
+            (4, 300000, "2025-03", "生活费", None),
+            (5, 750, "2025-04", None, "n5"),
+        ]
+        assert _rows(conn, "SELECT transaction_id, tag FROM transaction_tags ORDER BY transaction_id, tag") == [
+            (1, "冲动"),
+            (1, "社交"),
+            (5, "冲动"),
+        ]
+        assert _rows(conn, "SELECT month, category_main, budget_amount_cents FROM budgets ORDER BY id") == [
+            ("2025-03", None, 150050),
+            ("2025-03", "餐饮", 60000),
+        ]
+        assert _rows(conn, "SELECT amount_cents, payment_method FROM subscriptions") == [(2590, "微信")]
+        assert _rows(conn, "SELECT amount_cents FROM subscription_cancellations") == [(990,)]
+        assert _rows(conn, "SELECT amount_cents, transaction_id FROM subscription_charges") == [(2590, 2)]
+        assert _rows(conn, "SELECT target_amount_cents FROM goals") == [(1000001,)]
+        assert _rows(conn, "SELECT month, content FROM ai_archives") == [("2025-03", "三月复盘")]
+
+        assert _rows(conn, "SELECT * FROM monthly_category_rollup ORDER BY month, type, category_main") == [
+            ("2025-03", "expense", "交通", 30, 1),
+            ("2025-03", "expense", "餐饮", 3233, 2),
+            ("2025-03", "income", "收入", 300000, 1),
+            ("2025-04", "expense", "娱乐", 750, 1),
+        ]
+        assert _rows(conn, "SELECT * FROM daily_rollup ORDER BY date") == [
+            ("2025-03-01", 1264, 0, 2),
+            ("2025-03-05", 0, 300000, 0),
+            ("2025-03-15", 1999, 0, 1),
+            ("2025-04-02", 750, 0, 1),
+        ]
+        assert _rows(conn, "SELECT * FROM daily_cumulative_net ORDER BY date") == [
+            ("2025-03-01", 0, 1264),
+            ("2025-03-05", 300000, 1264),
+            ("2025-03-15", 300000, 3263),
+            ("2025-04-02", 300000, 4013),
+        ]
+        new_id = conn.execute(
+            """
+            INSERT INTO transactions (amount_cents, type, date, category_main)
+            VALUES (100, 'expense', '2025-04-05', '其他')
+            """
+        ).lastrowid
+        conn.rollback()
+
+    assert new_id == 7
+    stats = get_monthly_stats("2025-03")
+    assert stats["total_expense"] == 32.63
+    assert stats["total_income"] == 3000.0
+    assert {item["name"]: item["amount"] for item in stats["tag_stats"]} == {"冲动": 12.34, "社交": 12.34}
+
+
+def test_init_db_is_idempotent_on_a_migrated_database(db_path):
+    _build_legacy_database(db_path)
+    init_db()
+    init_db()
+
+    with get_connection() as conn:
+        assert get_schema_version(conn) == SCHEMA_VERSION
+        assert conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0] == 5
+        assert conn.execute("SELECT COUNT(*) FROM transaction_tags").fetchone()[0] == 3
@@ -0,0 +1,56 @@
+import io
+import json
+
+import services.import_service as import_service
+from conftest import count_transactions
+from services.import_service import import_transactions
+
+
+def test_csv_import_reports_bad_rows_and_keeps_good_ones(app):
+    content = "\n".join(
+        [
+            "date,type,amount,category_main,category_sub,tags,note",
+            "2025-03-01,expense,12.50,餐饮,午餐,冲动|社交,",
+            "2025-03-02,expense,inf,餐饮,,,",
+            "2025-03-03,expense,nan,交通,,,",
+            "2025-03-04,expense,1e400,交通,,,",
+            "2025-03-05,expense,-3,交通,,,",
+            "2025-03-06,income,3000,,生活费,,",
+        ]
+    ).encode("utf-8")
+
+    report = import_transactions(io.BytesIO(content), "csv", chunk_size=2)
+
+    assert report["imported"] == 2
+    assert report["failed"] == 4
+    assert [error["line"] for error in report["errors"]] == [3, 4, 5, 6]
+    assert count_transactions() == 2
+
+
+def test_write_failure_mid_chunk_is_reported_per_row(app, failing_writes):
+    failing_writes(import_service)
+    lines = [
+        json.dumps({"date": f"2025-03-{day:02d}", "amount": day, "category_main": "餐饮", "note": note})
+        for day, note in enumerate(["", "", "", "", "boom", "", ""], start=1)
+    ]
+
+    report = import_transactions(io.BytesIO("\n".join(lines).encode("utf-8")), "ndjson", chunk_size=3)
+
+    assert report["imported"] == 6
+    assert report["failed"] == 1
+    assert report["errors"] == [{"line": 5, "error": "failed to save: simulated write failure"}]
+    assert count_transactions() == 6
+
+
+def test_import_endpoint_returns_report_for_invalid_amounts(client):
+    content = b"date,type,amount,category_main\n2025-03-01,expense,inf,\xe9\xa4\x90\xe9\xa5\xae\n"
+
+    response = client.post(
+        "/api/transactions/import",
+        data={"file": (io.BytesIO(content), "ledger.csv")},
+        content_type="multipart/form-data",
+    )
+
+    assert response.status_code == 200
+    assert response.get_json()["imported"] == 0
+    assert response.get_json()["failed"] == 1
@@ -0,0 +1,51 @@
+from conftest import make_transaction
+from extensions.database import get_connection
+from models.month_close import month_snapshotted, reopen_month
+from models.transaction import create_transaction, get_monthly_stats
+
+
+def _snapshot_count(month: str) -> int:
+    with get_connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM month_snapshots WHERE month = ?", (month,)).fetchone()[0]
+
+
+def test_closed_month_result_is_snapshotted(app):
+    calls = []
+
+    @month_snapshotted("test_stats")
+    def compute(month: str) -> dict:
+        calls.append(month)
+        return {"total_expense": get_monthly_stats(month)["total_expense"]}
+
+    create_transaction(make_transaction(amount=20, date="2025-03-05"))
+
+    assert compute("2025-03") == {"total_expense": 20}
+    assert compute("2025-03") == {"total_expense": 20}
+    assert calls == ["2025-03"]
+    assert _snapshot_count("2025-03") == 1
+
+
+def test_write_during_compute_does_not_store_stale_snapshot(app):
+    @month_snapshotted("test_stats")
+    def compute(month: str) -> dict:
+        result = {"total_expense": get_monthly_stats(month)["total_expense"]}
+        if result["total_expense"] == 20:
+            create_transaction(make_transaction(amount=5, date="2025-02-10"))
+        return result
+
+    create_transaction(make_transaction(amount=20, date="2025-03-05"))
+
+    assert compute("2025-03") == {"total_expense": 20}
+    assert _snapshot_count("2025-03") == 0
+
+
+def test_reopened_month_is_computed_live(app):
+    @month_snapshotted("test_stats")
+    def compute(month: str) -> dict:
+        return {"total_expense": get_monthly_stats(month)["total_expense"]}
+
+    reopen_month("2025-03")
+    create_transaction(make_transaction(amount=20, date="2025-03-05"))
+
+    assert compute("2025-03") == {"total_expense": 20}
+    assert _snapshot_count("2025-03") == 0
@@ -0,0 +1,122 @@
+import services.transaction_service as transaction_service
+from conftest import make_transaction, stored_amounts
+from extensions.database import get_connection, rebuild_rollups
+from models.transaction import insert_transaction, insert_transactions
+
+
+def test_non_atomic_batch_reports_each_item(client):
+    items = [
+        make_transaction(amount=10),
+        make_transaction(amount="inf"),
+        make_transaction(amount=20, date="not-a-date"),
+        make_transaction(amount="nan"),
+        make_transaction(amount=30),
+    ]
+
+    response = client.post("/api/transactions/batch", json=items)
+
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body["created"] == 2
+    assert body["failed"] == 3
+    assert [result["index"] for result in body["results"]] == [0, 1, 2, 3, 4]
+    assert "id" in body["results"][0] and "id" in body["results"][4]
+    assert [("error" in result) for result in body["results"]] == [False, True, True, True, False]
+    assert stored_amounts() == [1000, 3000]
+
+
+def test_atomic_batch_rejects_everything_when_one_item_is_invalid(client):
+    items = [make_transaction(amount=10), make_transaction(amount="1e400"), make_transaction(amount=30)]
+
+    response = client.post("/api/transactions/batch?atomic=1", json=items)
+
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body["created"] == 0
+    assert body["failed"] == 1
+    assert "error" in body["results"][1]
+    assert all("id" not in result for result in body["results"])
+    assert stored_amounts() == []
+
+
+def test_atomic_batch_writes_all_items_in_one_transaction(client):
+    items = [make_transaction(amount=amount, tags=["冲动"]) for amount in (1, 2, 3)]
+
+    response = client.post("/api/transactions/batch", json={"transactions": items, "atomic": True})
+
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body["created"] == 3
+    assert [result["id"] for result in body["results"]] == sorted(result["id"] for result in body["results"])
+    assert stored_amounts() == [100, 200, 300]
+
+
+def test_non_atomic_batch_isolates_write_failures(app, failing_writes):
+    failing_writes(transaction_service)
+    items = [make_transaction(amount=1), make_transaction(amount=2, note="boom"), make_transaction(amount=3)]
+
+    result = transaction_service.create_transaction_batch(items, atomic=False)
+
+    assert result["created"] == 2
+    assert result["failed"] == 1
+    assert result["results"][1]["error"] == "failed to save: simulated write failure"
+    assert stored_amounts() == [100, 300]
+
+    atomic_result = transaction_service.create_transaction_batch(items, atomic=True)
+
+    assert atomic_result["created"] == 0
+    assert stored_amounts() == [100, 300]
+
+
+def test_insert_transactions_returns_the_ids_of_the_inserted_rows(app):
+    with get_connection() as conn:
+        insert_transactions(conn, [make_transaction(amount=1), make_transaction(amount=2)])
+        conn.execute("DELETE FROM transactions WHERE amount_cents = 200")
+        conn.commit()
+
+    items = [make_transaction(amount=amount, tags=[f"标签{amount}"]) for amount in (3, 4, 5)]
+    with get_connection() as conn:
+        single_id = insert_transaction(conn, make_transaction(amount=6))
+        ids = insert_transactions(conn, items)
+        conn.commit()
+        rows = conn.execute(
+            """
+            SELECT transactions.id, amount_cents, tag
+            FROM transactions LEFT JOIN transaction_tags ON transaction_tags.transaction_id = transactions.id
+            WHERE transactions.id IN (?, ?, ?)
+            ORDER BY transactions.id
+            """,
+            ids,
+        ).fetchall()
+
+    assert single_id == 3
+    assert ids == [4, 5, 6]
+    assert [tuple(row) for row in rows] == [(4, 300, "标签3"), (5, 400, "标签4"), (6, 500, "标签5")]
+
+
+def _cumulative_rows() -> list[tuple]:
+    with get_connection() as conn:
+        return [tuple(row) for row in conn.execute("SELECT * FROM daily_cumulative_net ORDER BY date").fetchall()]
+
+
+def test_batches_keep_cumulative_net_in_sync_with_a_full_rebuild(client):
+    client.post(
+        "/api/transactions/batch",
+        json=[
+            make_transaction(amount=10, date="2025-03-05"),
+            make_transaction(amount=3000, type="income", date="2025-03-01", category_sub="生活费"),
+        ],
+    )
+    client.post(
+        "/api/transactions/batch",
+        json=[make_transaction(amount=7.25, date="2025-02-20"), make_transaction(amount=2, date="2025-03-05")],
+    )
+    maintained = _cumulative_rows()
+
+    with get_connection() as conn:
+        rebuild_rollups(conn)
+
+    assert maintained == _cumulative_rows()
+    net_flow = client.get("/api/stats/net-flow?start=2025-02-01&end=2025-03-31").get_json()
+    assert net_flow["income"] == 3000.0
+    assert net_flow["expense"] == 19.25
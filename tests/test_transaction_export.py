@@ -0,0 +1,79 @@
+import csv
+import io
+import json
+
+import pytest
+
+from conftest import make_transaction
+from extensions import database
+from services.transaction_service import create_transactions
+
+TRANSACTIONS = [
+    make_transaction(amount=12.5, date="2025-03-01", tags=["冲动", "社交"], note='含逗号, 引号 " 的备注'),
+    make_transaction(amount=0.01, date="2025-03-01", category_main="交通", category_sub="", note="多行\n备注"),
+    make_transaction(amount=3000, type="income", date="2025-03-02", category_main="收入", category_sub="生活费"),
+    make_transaction(amount=99999.99, date="2025-04-15", category_main="学习", tags=["学习投资"]),
+]
+
+
+def _tags(value) -> tuple:
+    return tuple(value) if isinstance(value, list) else tuple(tag for tag in value.split("|") if tag)
+
+
+def _comparable(records: list[dict]) -> list[tuple]:
+    return [
+        (
+            record["date"],
+            record["type"],
+            float(record["amount"]),
+            record["category_main"],
+            record["category_sub"] or "",
+            _tags(record["tags"]),
+            record["note"] or "",
+        )
+        for record in records
+    ]
+
+
+def _parse_records(content: bytes, file_format: str) -> list[dict]:
+    text = content.decode("utf-8-sig")
+    if file_format == "csv":
+        assert content.startswith("\ufeff".encode("utf-8"))
+        return list(csv.DictReader(io.StringIO(text, newline="")))
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def _switch_database(monkeypatch, path) -> None:
+    database.close_pooled_connections()
+    monkeypatch.setattr(database, "DB_PATH", path)
+    database.init_db()
+
+
+@pytest.mark.parametrize("file_format", ["csv", "ndjson"])
+def test_export_then_import_round_trip(client, monkeypatch, tmp_path, file_format):
+    create_transactions(TRANSACTIONS)
+
+    exported = client.get(f"/api/transactions/export?format={file_format}").get_data()
+    _switch_database(monkeypatch, tmp_path / "restored.db")
+    response = client.post(
+        f"/api/transactions/import?format={file_format}",
+        data={"file": (io.BytesIO(exported), f"export.{file_format}")},
+        content_type="multipart/form-data",
+    )
+    assert response.get_json()["imported"] == len(TRANSACTIONS)
+    assert response.get_json()["failed"] == 0
+
+    restored = client.get("/api/transactions/export?format=ndjson").get_data(as_text=True)
+    assert _comparable(_parse_records(restored.encode("utf-8"), "ndjson")) == _comparable(
+        _parse_records(exported, file_format)
+    )
+
+
+def test_export_applies_filters(client):
+    create_transactions(TRANSACTIONS)
+
+    response = client.get("/api/transactions/export?format=ndjson&from=2025-03-01&to=2025-03-31&type=expense")
+
+    records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert response.mimetype == "application/x-ndjson"
+    assert [record["amount"] for record in records] == [12.5, 0.01]
@@ -0,0 +1,118 @@
+import pytest
+
+from conftest import make_transaction
+from extensions.database import get_connection
+from models.transaction import _transaction_page_query
+from services.transaction_service import create_transactions, decode_transaction_cursor, encode_transaction_cursor
+
+
+def _seed() -> list[dict]:
+    transactions = [
+        make_transaction(amount=5 + index, date="2025-03-10", tags=["冲动"] if index % 2 else [])
+        for index in range(7)
+    ]
+    transactions += [
+        make_transaction(amount=40, date="2025-03-11", category_main="交通"),
+        make_transaction(amount=8, date="2025-03-09", category_main="交通", tags=["冲动"]),
+        make_transaction(amount=3000, type="income", date="2025-03-10", category_sub="生活费"),
+        make_transaction(amount=15, date="2025-02-28"),
+    ]
+    ids = create_transactions(transactions)
+    return [{**transaction, "id": transaction_id} for transaction, transaction_id in zip(transactions, ids)]
+
+
+def _expected_ids(records: list[dict], predicate=lambda record: True) -> list[int]:
+    ordered = sorted(records, key=lambda record: (record["date"], record["id"]), reverse=True)
+    return [record["id"] for record in ordered if predicate(record)]
+
+
+def _collect_pages(client, query: str) -> tuple[list[int], int]:
+    ids: list[int] = []
+    pages = 0
+    cursor = None
+    while True:
+        suffix = f"&cursor={cursor}" if cursor else ""
+        body = client.get(f"/api/transactions/list?{query}{suffix}").get_json()
+        pages += 1
+        ids.extend(item["id"] for item in body["items"])
+        assert body["has_more"] is (body["next_cursor"] is not None)
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids, pages
+
+
+def test_cursor_round_trip():
+    assert decode_transaction_cursor(encode_transaction_cursor(("2025-03-10", 42))) == ("2025-03-10", 42)
+    assert encode_transaction_cursor(None) is None
+
+
+@pytest.mark.parametrize("cursor", ["", "2025-03-10", "2025-03-10_x", "2025-13-01_5", "garbage"])
+def test_invalid_cursor_is_rejected(cursor):
+    assert decode_transaction_cursor(cursor) is None
+
+
+def test_paging_breaks_ties_on_equal_dates_by_id(client):
+    records = _seed()
+
+    ids, pages = _collect_pages(client, "limit=2")
+
+    assert ids == _expected_ids(records)
+    assert len(set(ids)) == len(records)
+    assert pages == 6
+
+
+def test_filters_combine_with_cursor(client):
+    records = _seed()
+
+    ids, _ = _collect_pages(client, "limit=2&type=expense&tag=冲动&min_amount=6&max_amount=20")
+
+    assert ids == _expected_ids(
+        records,
+        lambda record: record["type"] == "expense" and "冲动" in record["tags"] and 6 <= record["amount"] <= 20,
+    )
+
+    ids, _ = _collect_pages(client, "limit=3&category=餐饮&from=2025-03-01&to=2025-03-10")
+
+    assert ids == _expected_ids(
+        records,
+        lambda record: record["category_main"] == "餐饮" and "2025-03-01" <= record["date"] <= "2025-03-10",
+    )
+
+
+def test_last_page_has_no_cursor(client):
+    _seed()
+
+    body = client.get("/api/transactions/list?limit=200").get_json()
+
+    assert len(body["items"]) == 11
+    assert body["has_more"] is False
+    assert body["next_cursor"] is None
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["limit=abc", "limit=0", "limit=-1", "min_amount=inf", "max_amount=nan", "min_amount=1e400", "cursor=bad"],
+)
+def test_invalid_parameters_return_400(client, query):
+    assert client.get(f"/api/transactions/list?{query}").status_code == 400
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"tx_type": "expense"},
+        {"tx_type": "income", "start_date": "2025-03-01", "end_date": "2025-03-31"},
+        {"tx_type": "expense", "category": "交通"},
+        {"category": "餐饮", "start_date": "2025-03-01"},
+        {"tag": "冲动", "tx_type": "expense"},
+        {"min_amount": 10, "max_amount": 50},
+    ],
+)
+def test_filtered_pages_do_not_sort_in_temp_btree(app, filters):
+    _seed()
+    for after in (None, ("2025-03-10", 5)):
+        sql, params = _transaction_page_query(**filters, after=after, limit=2)
+        with get_connection() as conn:
+            plan = [row["detail"] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()]
+        assert not any("TEMP B-TREE" in detail for detail in plan), plan
@@ -26,6 +26,11 @@ def month_sequence(month: str, count: int = 3) -> list[str]:
     return result
 
 
+def month_date_bounds(month: str) -> tuple[str, str]:
+    year, mon = map(int, month.split("-"))
+    return f"{month}-01", f"{month}-{calendar.monthrange(year, mon)[1]:02d}"
+
+
 def add_months(base_date: date, months: int) -> date:
     month_index = (base_date.month - 1) + months
     target_year = base_date.year + month_index // 12
@@ -1,3 +1,8 @@
+import math
+
+from config import MAX_AMOUNT
+
+
 def monthly_cost(amount: float, cycle: str) -> float:
     if cycle == "yearly":
         return round(amount / 12, 2)
@@ -6,3 +11,15 @@ def monthly_cost(amount: float, cycle: str) -> float:
     if cycle == "weekly":
         return round(amount * 52 / 12, 2)
     return round(amount, 2)
+
+
+def is_storable_amount(amount: float) -> bool:
+    return math.isfinite(amount) and abs(amount) <= MAX_AMOUNT
+
+
+def to_cents(amount: float) -> int:
+    return int(math.floor(float(amount) * 100 + 0.5))
+
+
+def from_cents(cents: int | None) -> float:
+    return round((cents or 0) / 100, 2)